@@ -0,0 +1,54 @@
+"""두 벤치마크 결과(JSON)를 단계별로 비교한다.
+
+    python -m benchmarks.compare old.json new.json --threshold 1.2
+
+새 결과가 기준보다 threshold배 넘게 느린 단계가 있으면 종료 코드 1을 돌려준다.
+"""
+import argparse
+import json
+import sys
+
+
+def _timings(path):
+    with open(path, encoding="utf-8") as f:
+        report = json.load(f)
+    timings = {}
+    for result in report["results"]:
+        timings[(result["scenario"], "cold")] = result["cold_s"]
+        for step in result["steps"]:
+            timings[(result["scenario"], f"{step['step']} (처음)")] = step["first_s"]
+            if step["warm_median_s"] is not None:
+                timings[(result["scenario"], f"{step['step']} (warm)")] = step["warm_median_s"]
+    return report["meta"], timings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=1.2, help="이 배수보다 느려지면 회귀로 본다")
+    parser.add_argument("--min-seconds", type=float, default=0.05, help="이보다 짧은 측정은 회귀 판정에서 뺀다")
+    args = parser.parse_args(argv)
+
+    base_meta, base = _timings(args.baseline)
+    cur_meta, cur = _timings(args.current)
+    print(f"기준 {base_meta.get('commit')} → 현재 {cur_meta.get('commit')}")
+
+    regressions = 0
+    # 현재 결과에 기록된 순서(시나리오, 단계 순)대로 보여준다
+    for key in [k for k in cur if k in base]:
+        before, after = base[key], cur[key]
+        ratio = after / before if before else float("inf")
+        slower = ratio > args.threshold and after >= args.min_seconds
+        regressions += slower
+        mark = "느려짐" if slower else ""
+        print(f"{key[0]:<28} {key[1]:<28} {before:8.3f}s → {after:8.3f}s  x{ratio:5.2f} {mark}")
+    for key in [k for k in cur if k not in base]:
+        print(f"{key[0]:<28} {key[1]:<28} (새 항목) {cur[key]:8.3f}s")
+
+    print(f"회귀 {regressions}건")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,38 @@
+"""업로드 벤치마크용 엑셀 파일 생성기.
+
+행 수별로 한 번만 만들어 data_dir에 두고 다시 쓴다. 100만 행도 만들 수 있도록
+openpyxl write-only 모드로 한 줄씩 쓴다.
+"""
+import os
+from datetime import datetime, timedelta
+
+import numpy as np
+
+COLUMNS = ["반", "점수", "키", "날짜", "메모"]
+
+
+def upload_xlsx(rows, data_dir):
+    """rows행짜리 (반, 점수, 키, 날짜, 메모) 엑셀 파일 경로를 돌려준다."""
+    from openpyxl import Workbook
+
+    os.makedirs(data_dir, exist_ok=True)
+    path = os.path.join(data_dir, f"upload_{rows}.xlsx")
+    if os.path.exists(path):
+        return path
+
+    rng = np.random.default_rng(0)
+    classes = rng.choice(["1반", "2반", "3반", "4반"], rows).tolist()
+    scores = rng.integers(0, 100, rows).tolist()
+    heights = np.round(rng.normal(170, 5, rows), 2).tolist()
+    memos = np.where(rng.random(rows) < 0.1, None, "ok").tolist()
+    start = datetime(2025, 1, 1)
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Sheet1")
+    sheet.append(COLUMNS)
+    for i in range(rows):
+        sheet.append([classes[i], scores[i], heights[i], start + timedelta(minutes=i), memos[i]])
+    tmp_path = path + ".tmp"
+    workbook.save(tmp_path)
+    os.replace(tmp_path, path)
+    return path
@@ -0,0 +1,198 @@
+"""페이지별 재실행 시간 벤치마크.
+
+main.py와 pages/의 각 페이지를 streamlit.testing.v1.AppTest로 화면 없이 실행하면서,
+처음 실행(cold: Streamlit 캐시와 디스크 캐시가 빈 상태)과 주요 위젯 조작(도시 변경,
+슬라이더, 그래프 종류, 업로드 행 수) 직후/반복 재실행(warm) 시간을 잰다. 결과는 JSON으로
+저장해 커밋끼리 비교한다 (benchmarks/compare.py).
+
+    python -m benchmarks.run                                # 업로드 1천/10만 행
+    python -m benchmarks.run --rows 1000,100000,1000000     # 100만 행 업로드 포함
+    python -m benchmarks.run --only main,pages/03 --repeat 5 --output bench_output.json
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# utils.config가 불리기 전에 캐시 디렉터리를 임시 폴더로 바꾼다 (실제 .cache를 건드리지 않음)
+os.environ.setdefault("A1_CACHE_DIR", tempfile.mkdtemp(prefix="a1-bench-"))
+sys.path.insert(0, str(ROOT))
+
+from benchmarks import stubs  # noqa: E402
+from benchmarks.data import upload_xlsx  # noqa: E402
+
+
+@dataclass
+class Scenario:
+    name: str
+    page: str
+    # (설명, at을 바꾸는 함수) 목록. 각 단계마다 조작 직후 1회 + warm 재실행 repeat회를 잰다
+    steps: list = field(default_factory=list)
+    upload: str = None
+
+
+def set_widget(kind, label, value):
+    def action(at):
+        widgets = [w for w in getattr(at, kind) if w.label == label]
+        if not widgets:
+            raise LookupError(f"{kind} '{label}' 위젯이 없습니다")
+        widgets[0].set_value(value)
+    return action
+
+
+def build_scenarios(rows, data_dir):
+    scenarios = [
+        Scenario("main/도시 변경", "main.py", [
+            ("도시=교토", set_widget("selectbox", "도시를 선택하세요", "교토")),
+            ("도시=오사카", set_widget("selectbox", "도시를 선택하세요", "오사카")),
+            ("도시=도쿄 (다시)", set_widget("selectbox", "도시를 선택하세요", "도쿄")),
+            ("전국 보기", set_widget("radio", "보기 방식", "전국 보기")),
+        ]),
+        Scenario("00/기간·표시 방식", "pages/00_주식데이터시각화.py", [
+            ("기간=최근 5년", set_widget("selectbox", "조회 기간", "최근 5년")),
+            ("기간=최근 20년", set_widget("selectbox", "조회 기간", "최근 20년")),
+            ("표시=낙폭", set_widget("radio", "표시 방식", "낙폭 (Drawdown)")),
+            ("차트 너비=1600", set_widget("slider", "차트 너비 (px)", 1600)),
+        ]),
+        Scenario("01/분포·슬라이더", "pages/01_뭔가추천해줌.py", [
+            ("학생 수=1,000,000", set_widget("select_slider", "학생 수 (표본 크기)", 1_000_000)),
+            ("측정 횟수=1,000,000", set_widget("select_slider", "측정 횟수", 1_000_000)),
+            ("함수 그래프", set_widget("radio", "어떤 시각화를 보시겠어요?", "함수 그래프 그리기")),
+            ("기울기 a=2.0", set_widget("slider", "기울기 (a)", 2.0)),
+            ("위상 φ=1.0", set_widget("slider", "위상 (φ)", 1.0)),
+            ("기울기 a=1.0 (다시)", set_widget("slider", "기울기 (a)", 1.0)),
+            ("브라우저 모드", set_widget("radio", "그래프 조작 방식", "브라우저에서 바로 보기 (미리 계산)")),
+            ("인터랙티브 지도", set_widget("radio", "어떤 시각화를 보시겠어요?", "인터랙티브 지도")),
+            ("지진=100,000", set_widget("select_slider", "지진 데이터 개수", 100_000)),
+            ("카탈로그=1,000,000", set_widget("select_slider", "가상 지진 데이터 개수", 1_000_000)),
+        ]),
+        Scenario("02/첫 화면", "pages/02_뭔가추천해줌수정.py"),
+    ]
+    for n in rows:
+        path = upload_xlsx(n, data_dir)
+        for page in ("pages/03_수정수정.py", "pages/화가난다.py"):
+            scenarios.append(Scenario(f"{Path(page).stem}/업로드 {n:,}행", page, [
+                ("선그래프", set_widget("selectbox", "그래프 종류를 선택하세요", "선그래프")),
+                ("히스토그램", set_widget("selectbox", "그래프 종류를 선택하세요", "히스토그램")),
+                ("막대그래프", set_widget("selectbox", "그래프 종류를 선택하세요", "막대그래프")),
+            ], upload=path))
+    return scenarios
+
+
+def reset_caches():
+    # cold 측정: Streamlit 메모리 캐시와 디스크 캐시(A1_CACHE_DIR)를 모두 비운다
+    import streamlit as st
+
+    st.cache_data.clear()
+    st.cache_resource.clear()
+    cache_dir = Path(os.environ["A1_CACHE_DIR"])
+    shutil.rmtree(cache_dir, ignore_errors=True)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+
+
+def timed_run(at, timeout):
+    start = time.perf_counter()
+    at.run(timeout=timeout)
+    elapsed = time.perf_counter() - start
+    return elapsed, [e.message for e in at.exception]
+
+
+def run_scenario(scenario, uploads, repeat, timeout):
+    from streamlit.testing.v1 import AppTest
+
+    reset_caches()
+    uploads.path = scenario.upload
+    at = AppTest.from_file(str(ROOT / scenario.page), default_timeout=timeout)
+    cold, errors = timed_run(at, timeout)
+    result = {"scenario": scenario.name, "page": scenario.page, "cold_s": round(cold, 4), "steps": [],
+              "errors": errors}
+
+    for label, action in scenario.steps:
+        try:
+            action(at)
+            first, errors = timed_run(at, timeout)
+            warm = []
+            for _ in range(repeat):
+                elapsed, more = timed_run(at, timeout)
+                warm.append(round(elapsed, 4))
+                errors += more
+        except Exception as e:
+            # 위젯을 못 찾았거나 제한 시간을 넘긴 경우: 기록만 하고 이 시나리오는 멈춘다
+            result["errors"].append(f"{label}: {type(e).__name__}: {e}")
+            break
+        result["steps"].append({
+            "step": label,
+            "first_s": round(first, 4),
+            "warm_s": warm,
+            "warm_median_s": round(statistics.median(warm), 4) if warm else None,
+        })
+        result["errors"] += [f"{label}: {message}" for message in errors]
+    uploads.path = None
+    return result
+
+
+def metadata(args):
+    import streamlit
+
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "time": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "streamlit": streamlit.__version__,
+        "platform": platform.platform(),
+        "rows": args.rows,
+        "repeat": args.repeat,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", default="1000,100000", help="업로드 행 수 목록 (쉼표 구분, 예: 1000,100000,1000000)")
+    parser.add_argument("--repeat", type=int, default=3, help="단계마다 warm 재실행 횟수")
+    parser.add_argument("--only", default="", help="이름에 이 문자열이 들어간 시나리오만 (쉼표 구분)")
+    parser.add_argument("--timeout", type=float, default=600.0, help="재실행 한 번의 제한 시간(초)")
+    parser.add_argument("--data-dir", default=str(ROOT / ".cache" / "bench_data"), help="업로드용 엑셀 파일 보관 폴더")
+    parser.add_argument("--output", default=str(ROOT / "bench_output.json"))
+    args = parser.parse_args(argv)
+    args.rows = [int(n) for n in args.rows.split(",") if n]
+
+    # 한글 폰트가 없는 환경에서 그림마다 나오는 글리프 경고는 숨긴다
+    warnings.filterwarnings("ignore", message="Glyph .* missing from font")
+    uploads = stubs.install()
+    filters = [f for f in args.only.split(",") if f]
+    results = []
+    for scenario in build_scenarios(args.rows, args.data_dir):
+        if filters and not any(f in scenario.name or f in scenario.page for f in filters):
+            continue
+        result = run_scenario(scenario, uploads, args.repeat, args.timeout)
+        results.append(result)
+        steps = ", ".join(f"{s['step']} {s['first_s']:.2f}/{s['warm_median_s'] or 0:.2f}s" for s in result["steps"])
+        status = "ok" if not result["errors"] else f"오류 {len(result['errors'])}건"
+        print(f"[{status}] {scenario.name}: cold {result['cold_s']:.2f}s  {steps}", flush=True)
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump({"meta": metadata(args), "results": results}, f, ensure_ascii=False, indent=2)
+    print(f"결과 저장: {args.output}")
+    return 1 if any(r["errors"] for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+"""벤치마크용 네트워크/업로드 대체물.
+
+페이지를 AppTest로 실행할 때 외부 서버에 접속하지 않도록 yfinance.download와
+urllib.request.urlopen(관광지 사진)을 로컬 함수로 바꾸고, st.file_uploader는 지정한
+로컬 파일을 업로드한 것처럼 돌려준다.
+"""
+import io
+import os
+import urllib.request
+
+import numpy as np
+import pandas as pd
+
+
+def fake_download(ticker, start=None, end=None, **kwargs):
+    # 티커마다 같은 값이 나오는 가상 일봉 (yfinance와 같은 열 이름)
+    index = pd.bdate_range(start, end, inclusive="left")
+    rng = np.random.default_rng(sum(map(ord, str(ticker))))
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, len(index))))
+    return pd.DataFrame(
+        {"Open": close, "High": close, "Low": close, "Close": close, "Adj Close": close, "Volume": 1_000},
+        index=index,
+    )
+
+
+def _fake_image():
+    from PIL import Image
+
+    buffer = io.BytesIO()
+    Image.new("RGB", (1024, 768), "#6c8ebf").save(buffer, "JPEG")
+    return buffer.getvalue()
+
+
+class _FakeResponse(io.BytesIO):
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class FakeUploads:
+    """st.file_uploader 대체. type 목록에 맞는 확장자의 파일이 지정돼 있으면 그 파일을 돌려준다."""
+
+    def __init__(self):
+        self.path = None
+
+    def __call__(self, label, type=None, *args, **kwargs):
+        if self.path is None:
+            return None
+        extension = os.path.splitext(self.path)[1].lstrip(".").lower()
+        if type is not None and extension not in [t.lstrip(".").lower() for t in type]:
+            return None
+        with open(self.path, "rb") as f:
+            upload = io.BytesIO(f.read())
+        upload.name = os.path.basename(self.path)
+        return upload
+
+
+def install():
+    """대체물을 설치하고 업로드 파일을 바꿀 수 있는 FakeUploads를 돌려준다."""
+    import streamlit
+    import yfinance
+
+    yfinance.download = fake_download
+    image = _fake_image()
+    urllib.request.urlopen = lambda request, timeout=None: _FakeResponse(image)
+    uploads = FakeUploads()
+    streamlit.file_uploader = uploads
+    return uploads
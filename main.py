@@ -1,100 +1,33 @@
+import copy
+
 import streamlit as st
 import folium
+from folium.plugins import FastMarkerCluster
 from streamlit_folium import st_folium
+from utils.attractions import SpotIndex, data_version, flatten_spots, load_attractions
+from utils.image_cache import ThumbnailCache, placeholder_image
+from utils.profiler import profile_page, show_profile
 
 st.set_page_config(page_title="일본 관광지 가이드", layout="wide")
+profile_page("일본 관광지 가이드")
 
-# 관광지 정보
-tourist_spots = {
-    "도쿄": {
-        "위치": [35.682839, 139.759455],
-        "설명": "일본의 수도 도쿄는 현대성과 전통이 공존하는 도시입니다. 쇼핑, 음식, 역사적인 사원 등 다양한 매력을 가지고 있습니다.",
-        "명소": {
-            "도쿄타워": {
-                "위치": [35.6586, 139.7454],
-                "설명": "파리의 에펠탑을 본따 만든 도쿄의 랜드마크",
-                "이미지": "https://upload.wikimedia.org/wikipedia/commons/thumb/3/37/Tokyo_Tower_2023.jpg/800px-Tokyo_Tower_2023.jpg"
-            },
-            "아사쿠사": {
-                "위치": [35.7148, 139.7967],
-                "설명": "센소지 사원과 전통 상점이 유명한 지역",
-                "이미지": "https://upload.wikimedia.org/wikipedia/commons/thumb/c/c5/Sensoji_Temple_at_night_%28cropped%29.jpg/800px-Sensoji_Temple_at_night_%28cropped%29.jpg"
-            },
-            "시부야 스크램블": {
-                "위치": [35.6595, 139.7005],
-                "설명": "세계에서 가장 분주한 교차로 중 하나",
-                "이미지": "https://upload.wikimedia.org/wikipedia/commons/thumb/b/b3/Shibuya_Crossing_in_Tokyo.jpg/800px-Shibuya_Crossing_in_Tokyo.jpg"
-            }
-        }
-    },
-    "교토": {
-        "위치": [35.0116, 135.7681],
-        "설명": "옛 수도 교토는 수많은 절과 신사, 전통 건축물들이 모여 있는 역사적인 도시입니다.",
-        "명소": {
-            "기요미즈데라": {
-                "위치": [34.9949, 135.7850],
-                "설명": "산 중턱에 위치한 유명한 사찰",
-                "이미지": "https://upload.wikimedia.org/wikipedia/commons/thumb/b/b2/Kiyomizu-dera_in_Kyoto-2.jpg/800px-Kiyomizu-dera_in_Kyoto-2.jpg"
-            },
-            "금각사": {
-                "위치": [35.0394, 135.7292],
-                "설명": "황금으로 덮인 아름다운 절",
-                "이미지": "https://upload.wikimedia.org/wikipedia/commons/thumb/1/1b/Kinkaku-ji-e1447047702672.jpg/800px-Kinkaku-ji-e1447047702672.jpg"
-            },
-            "후시미 이나리 신사": {
-                "위치": [34.9671, 135.7727],
-                "설명": "수천 개의 붉은 도리이 문으로 유명",
-                "이미지": "https://upload.wikimedia.org/wikipedia/commons/thumb/a/a2/Fushimi_Inari-taisha%2C_Kyoto%2C_Japan.jpg/800px-Fushimi_Inari-taisha%2C_Kyoto%2C_Japan.jpg"
-            }
-        }
-    },
-    "오사카": {
-        "위치": [34.6937, 135.5023],
-        "설명": "활기찬 분위기와 맛있는 거리 음식으로 유명한 일본 제2의 도시.",
-        "명소": {
-            "오사카성": {
-                "위치": [34.6873, 135.5262],
-                "설명": "도요토미 히데요시가 건설한 역사적 성",
-                "이미지": "https://upload.wikimedia.org/wikipedia/commons/thumb/a/a7/Osaka_Castle08s3200.jpg/800px-Osaka_Castle08s3200.jpg"
-            },
-            "도톤보리": {
-                "위치": [34.6687, 135.5012],
-                "설명": "네온사인과 거리 음식으로 유명한 관광지",
-                "이미지": "https://upload.wikimedia.org/wikipedia/commons/thumb/f/f7/Dotonbori_at_night.jpg/800px-Dotonbori_at_at_night.jpg"
-            },
-            "유니버설 스튜디오 재팬": {
-                "위치": [34.6654, 135.4323],
-                "설명": "인기 테마파크",
-                "이미지": "https://upload.wikimedia.org/wikipedia/commons/thumb/7/77/Universal_Studios_Japan_Globe.jpg/800px-Universal_Studios_Japan_Globe.jpg"
-            }
-        }
-    }
-}
+# 관광지 정보 (data/attractions.json, 파일이 바뀌면 version이 바뀌어 다시 읽는다)
+@st.cache_data
+def get_tourist_spots(version):
+    return load_attractions()
 
-# 사이드바에서 도시 선택
-st.sidebar.title("🇯🇵 일본 주요 도시")
-selected_city = st.sidebar.selectbox("도시를 선택하세요", list(tourist_spots.keys()))
-
-# 도시 정보 표시
-city_info = tourist_spots[selected_city]
-st.title(f"🇯🇵 {selected_city} 관광 가이드")
-st.markdown(city_info["설명"])
-
-# 관광지 목록 이미지
-columns = st.columns(3)
-column_index = 0
-for name, spot in city_info["명소"].items():
-    with columns[column_index]:
-        if "이미지" in spot:
-            st.image(spot["이미지"], caption=name, use_container_width=True)
-        st.markdown(f"**{name}**")
-    column_index = (column_index + 1) % 3
 
-# 지도 + 상세 설명 칼럼
-col1, col2 = st.columns([2, 1])
+# 모든 명소를 격자 칸에 나눠 담아 두고, 주변 명소 검색 때 가까운 칸만 살펴본다
+@st.cache_resource
+def get_spot_index(version):
+    return SpotIndex(flatten_spots(get_tourist_spots(version)))
 
-with col1:
-    st.subheader("🗺️ 관광 지도")
+
+# 도시별 지도는 (도시, 데이터 버전)마다 한 번만 만들어 둔다
+# st_folium이 렌더링하면서 지도 객체에 스크립트를 덧붙이므로, 쓸 때는 복사본을 넘긴다
+@st.cache_resource(max_entries=32)
+def get_city_map(city, version):
+    city_info = get_tourist_spots(version)[city]
     m = folium.Map(
         location=city_info["위치"],
         zoom_start=12,
@@ -103,7 +36,7 @@ with col1:
 
     folium.Marker(
         city_info["위치"],
-        popup=f"{selected_city} 중심",
+        popup=f"{city} 중심",
         icon=folium.Icon(color='blue')
     ).add_to(m)
 
@@ -114,16 +47,132 @@ with col1:
             popup=folium.Popup(name, parse_html=True),
             icon=folium.Icon(color='red', icon="info-sign")
         ).add_to(m)
+    return m
+
+
+# 명소 사진은 서버에서 한 번 받아 WebP 썸네일로 저장해 두고 로컬 파일로 보여준다
+@st.cache_resource
+def get_thumbnail_cache():
+    return ThumbnailCache()
+
+
+@st.cache_data
+def get_placeholder_image():
+    return placeholder_image()
+
+
+version = data_version()
+tourist_spots = get_tourist_spots(version)
+# 명소 이름 -> (도시, 명소 정보)
+all_spots = {name: (city, spot) for city, info in tourist_spots.items() for name, spot in info["명소"].items()}
+
+# 전국 보기에서 화면 범위를 아직 모를 때 쓰는 일본 전체 범위 (남, 서, 북, 동)
+JAPAN_BOUNDS = (24.0, 122.0, 46.0, 146.0)
+
+# 전국 보기 명소 마커: 브라우저에서 [위도, 경도, 이름] 배열로 마커를 만든다
+SPOT_MARKER_JS = """
+function (row) {
+    var marker = L.marker(new L.LatLng(row[0], row[1]));
+    marker.bindTooltip(row[2]);
+    marker.bindPopup(row[2]);
+    return marker;
+}
+"""
+
+
+def visible_bounds(map_state, padding=0.25):
+    # st_folium이 돌려준 지도 범위를 조금 넓혀서, 살짝 움직일 때마다 다시 불러오지 않게 한다
+    bounds = (map_state or {}).get("bounds") or {}
+    sw, ne = bounds.get("_southWest") or {}, bounds.get("_northEast") or {}
+    if sw.get("lat") is None or ne.get("lat") is None:
+        return JAPAN_BOUNDS
+    pad_lat = (ne["lat"] - sw["lat"]) * padding
+    pad_lng = (ne["lng"] - sw["lng"]) * padding
+    return sw["lat"] - pad_lat, sw["lng"] - pad_lng, ne["lat"] + pad_lat, ne["lng"] + pad_lng
+
+
+# 사이드바에서 보기 방식과 도시 선택
+st.sidebar.title("🇯🇵 일본 주요 도시")
+view_mode = st.sidebar.radio("보기 방식", ["도시별 보기", "전국 보기"])
+
+if view_mode == "도시별 보기":
+    selected_city = st.sidebar.selectbox("도시를 선택하세요", list(tourist_spots.keys()))
+
+    # 도시 정보 표시
+    city_info = tourist_spots[selected_city]
+    st.title(f"🇯🇵 {selected_city} 관광 가이드")
+    st.markdown(city_info["설명"])
+
+    # 관광지 목록 이미지 (이 도시의 사진을 모두 백그라운드에서 동시에 받기 시작)
+    thumbnails = get_thumbnail_cache()
+    thumbnails.prefetch([spot["이미지"] for spot in city_info["명소"].values() if "이미지" in spot])
+    columns = st.columns(3)
+    column_index = 0
+    for name, spot in city_info["명소"].items():
+        with columns[column_index]:
+            if "이미지" in spot:
+                image_path = thumbnails.get(spot["이미지"])
+                if image_path is not None:
+                    st.image(str(image_path), caption=name, use_container_width=True)
+                elif thumbnails.loading(spot["이미지"]):
+                    # 받는 중인 사진은 기다리지 않고 자리만 잡아 두고, 다음 재실행에서 보여준다
+                    st.image(get_placeholder_image(), caption=f"{name} (사진을 불러오는 중입니다)", use_container_width=True)
+                else:
+                    st.image(get_placeholder_image(), caption=f"{name} (사진을 불러올 수 없습니다)", use_container_width=True)
+            st.markdown(f"**{name}**")
+        column_index = (column_index + 1) % 3
+else:
+    st.title("🇯🇵 일본 전국 관광 지도")
+    st.markdown("지도를 움직이거나 확대하면 화면 안에 있는 명소만 불러와서 묶음(클러스터)으로 보여줍니다.")
+
+# 지도 + 상세 설명 칼럼
+# fragment로 감싸서, 마커 클릭이나 지도 이동 때는 페이지 전체(사진 등)가 아니라 이 부분만 다시 실행한다
+@st.fragment
+def show_map_and_details(view_mode, selected_city=None):
+    spot_index = get_spot_index(version)
+    col1, col2 = st.columns([2, 1])
+
+    with col1:
+        st.subheader("🗺️ 관광 지도")
+        if view_mode == "도시별 보기":
+            m = copy.deepcopy(get_city_map(selected_city, version))
+            st_data = st_folium(m, width=600, height=450, returned_objects=["last_active_popup"])
+        else:
+            # 기본 지도는 그대로 두고, 화면 범위 안의 명소 묶음만 feature group으로 바꿔 보낸다
+            visible = spot_index.in_bounds(*visible_bounds(st.session_state.get("japan_map")))
+            m = folium.Map(location=[36.5, 138.0], zoom_start=5, tiles='OpenStreetMap')
+            spot_layer = folium.FeatureGroup(name="명소")
+            FastMarkerCluster(
+                visible[["위도", "경도", "이름"]].values.tolist(), callback=SPOT_MARKER_JS
+            ).add_to(spot_layer)
+
+            st_data = st_folium(
+                m, key="japan_map", feature_group_to_add=spot_layer, width=600, height=450,
+                returned_objects=["last_active_popup", "bounds", "zoom"]
+            )
+            st.caption(f"현재 화면 범위의 명소 {len(visible):,}개를 불러왔습니다.")
+
+    with col2:
+        st.subheader("📍 명소별 상세 설명")
+        st.info("지도에서 명소 마커를 클릭하면 아래에 설명이 나타납니다.")
+
+        clicked_spot_name = st_data.get("last_active_popup") if st_data else None
+        if clicked_spot_name and clicked_spot_name in all_spots:
+            spot_city, spot = all_spots[clicked_spot_name]
+            st.markdown("---")
+            st.markdown(f"### {clicked_spot_name}")
+            if view_mode == "전국 보기":
+                st.caption(spot_city)
+            st.markdown(spot["설명"])
+
+            # 클릭한 명소 주변의 가까운 명소 (다른 도시 포함)
+            st.markdown("#### 🧭 주변 명소")
+            nearby = spot_index.nearest(*spot["위치"], k=5, exclude=[clicked_spot_name])
+            for _, row in nearby.iterrows():
+                st.markdown(f"- **{row['이름']}** ({row['도시']}) · {row['거리 (km)']:.1f} km")
 
-    st_data = st_folium(m, width=600, height=450, returned_objects=["last_active_popup"])
 
-with col2:
-    st.subheader("📍 명소별 상세 설명")
-    st.info("지도에서 명소 마커를 클릭하면 아래에 설명이 나타납니다.")
+show_map_and_details(view_mode, selected_city if view_mode == "도시별 보기" else None)
 
-    clicked_spot_name = st_data.get("last_active_popup") if st_data else None
-    if clicked_spot_name and clicked_spot_name in city_info["명소"]:
-        spot = city_info["명소"][clicked_spot_name]
-        st.markdown("---")
-        st.markdown(f"### {clicked_spot_name}")
-        st.markdown(spot["설명"])
+# 성능 측정을 켠 경우 이번 재실행 기록을 남기고 사이드바에 보여준다
+show_profile()
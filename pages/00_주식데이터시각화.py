@@ -1,8 +1,43 @@
+import pandas as pd
 import streamlit as st
-import yfinance as yf
-import plotly.graph_objs as go
+from utils.fetch_scheduler import FetchScheduler
+from utils.price_matrix import PriceEngine
+from utils.price_store import PriceStore
+from utils.profiler import profile_page, section, show_profile
+from utils.runtime import lazy_import
+
+# plotly는 그래프를 처음 그릴 때 불러온다 (yfinance는 PriceStore가 데이터를 받을 때 불러옴)
+go = lazy_import("plotly.graph_objs")
+
+
+# 티커별 일봉을 로컬 Parquet 저장소에 보관하고, 빠진 날짜 구간만 새로 받아온다
+@st.cache_resource
+def get_price_store():
+    return PriceStore()
+
+
+# 호스트별 요청 제한이 재실행과 세션 사이에서도 지켜지도록 스케줄러는 프로세스에 하나만 둔다
+@st.cache_resource
+def get_fetch_scheduler():
+    return FetchScheduler()
+
+
+# 티커들을 스레드 풀에서 동시에 받아와 날짜×티커 종가 행렬로 맞춘다
+# (티커 집합, 기간)별로 행렬과 지표를 기억해 두므로 재실행 시 다시 계산하지 않는다
+@st.cache_resource
+def get_price_engine():
+    store = get_price_store()
+    scheduler = get_fetch_scheduler()
+
+    def load_frames(tickers, start, end):
+        # 실패한 티커는 재시도 후에도 안 되면 errors에 모이고, 나머지로 차트를 그린다
+        return scheduler.fetch_all(tickers, lambda ticker: store.get(ticker, start, end))
+
+    return PriceEngine(load_frames)
+
 
 st.title("🌍 글로벌 시가총액 Top5 주식 종가 차트")
+profile_page("주식 데이터 시각화")
 
 # 글로벌 시가총액 Top5 티커 (예시)
 tickers = {
@@ -13,20 +48,99 @@ tickers = {
     "Amazon": "AMZN"
 }
 
-start_date = "2023-01-01"
-end_date = "2023-06-01"
+# 조회 기간 (최근 N년은 오늘까지)
+today = pd.Timestamp.today().normalize()
+periods = {
+    "2023년 1~5월": ("2023-01-01", "2023-06-01"),
+    "최근 1년": (today - pd.DateOffset(years=1), today + pd.Timedelta(days=1)),
+    "최근 5년": (today - pd.DateOffset(years=5), today + pd.Timedelta(days=1)),
+    "최근 20년": (today - pd.DateOffset(years=20), today + pd.Timedelta(days=1)),
+}
+period = st.sidebar.selectbox("조회 기간", list(periods.keys()))
+start_date, end_date = (pd.Timestamp(d).strftime("%Y-%m-%d") for d in periods[period])
+
+# 대용량 모드: 각 선을 차트 너비(픽셀)만큼의 점으로 줄이고(LTTB) WebGL로 그린다
+st.sidebar.subheader("렌더링")
+chart_width = st.sidebar.slider("차트 너비 (px)", 400, 2000, 1000, 100)
+
+# 표시 방식 선택 (통화가 다른 종목은 '정규화'로 비교)
+views = {
+    "종가": ("values", "종가 (현지 통화)"),
+    "정규화 (시작일=100)": ("normalized", "상대 성과 (시작일=100)"),
+    "낙폭 (Drawdown)": ("drawdown", "최고가 대비 하락률"),
+}
+view = st.radio("표시 방식", list(views.keys()), horizontal=True)
+ma_windows = st.multiselect("이동평균선", [5, 20, 60], default=[])
+
+# (빠진 구간만 yf.download로 받아 오므로 캐시가 차 있으면 거의 걸리지 않는다)
+with section("가격 데이터 (yf.download)") as price_section:
+    matrix = get_price_engine().matrix(list(tickers.values()), start_date, end_date)
+    price_section.rows = len(matrix.dates) * len(matrix.tickers)
+companies = {ticker: company for company, ticker in tickers.items()}
+
+# 받아오지 못한 종목은 차트에서 빠지므로 어떤 종목인지 알려 준다 (다음 재실행에서 다시 시도)
+if matrix.missing:
+    lines = [f"- {companies[ticker]} ({ticker}): {matrix.errors.get(ticker) or '데이터 없음'}" for ticker in matrix.missing]
+    st.warning("다음 종목의 데이터를 불러오지 못해 차트에서 뺐습니다.\n\n" + "\n".join(lines))
+
+attr, y_title = views[view]
+values = getattr(matrix, attr)
+
+# 보고 싶은 구간을 고르면 그 구간만 다시 잘라서 원래 해상도에 가깝게 그린다 (확대)
+dates = matrix.dates
+if len(dates) > 1:
+    first_day, last_day = dates[0].date(), dates[-1].date()
+    zoom_start, zoom_end = st.slider("표시 구간", first_day, last_day, (first_day, last_day))
+    rows = slice(dates.searchsorted(pd.Timestamp(zoom_start)), dates.searchsorted(pd.Timestamp(zoom_end), side="right"))
+else:
+    rows = slice(0, len(dates))
+
+total_points = int(values[rows].size)
+fast_mode = st.sidebar.checkbox(
+    "대용량 모드 (LTTB + WebGL)", value=total_points > 20 * chart_width,
+    help="선마다 차트 너비만큼의 점만 남겨서 보냅니다. 표시 구간을 좁히면 원래 해상도로 그려집니다."
+)
+Trace = go.Scattergl if fast_mode else go.Scatter
+
+
+def add_lines(name, values, suffix="", **kwargs):
+    # 대용량 모드에서 줄인 선은 행렬에 기억되어 있어 재실행에서는 LTTB를 다시 돌지 않는다
+    if fast_mode:
+        lines = matrix.downsampled(name, values, rows.start, rows.stop, chart_width)
+    else:
+        lines = matrix.lines(values, rows.start, rows.stop)
+    for ticker, (x, y) in zip(matrix.tickers, lines):
+        fig.add_trace(Trace(x=x, y=y, mode='lines', name=companies[ticker] + suffix, **kwargs))
+
 
 fig = go.Figure()
+add_lines(attr, values)
 
-for company, ticker in tickers.items():
-    data = yf.download(ticker, start=start_date, end=end_date)
-    fig.add_trace(go.Scatter(x=data.index, y=data['Close'], mode='lines', name=company))
+# 이동평균은 종가 기준이므로 '종가' 보기에서만 겹쳐 그린다
+if view == "종가":
+    for window in ma_windows:
+        add_lines(f"ma{window}", matrix.moving_average(window), f" MA{window}", line=dict(dash='dot', width=1))
 
 fig.update_layout(
-    title="글로벌 시가총액 Top5 종가 추이",
+    title=f"글로벌 시가총액 Top5 {view} 추이",
     xaxis_title="날짜",
-    yaxis_title="종가 (USD)",
+    yaxis_title=y_title,
     legend_title="기업"
 )
 
 st.plotly_chart(fig)
+if fast_mode:
+    st.caption(f"대용량 모드: 선마다 최대 {chart_width}개 점으로 줄여서 표시합니다 (원본 {total_points:,}개 점).")
+
+if len(matrix.tickers) > 1:
+    st.subheader("일간 수익률 상관계수")
+    corr = matrix.correlation
+    labels = [companies[ticker] for ticker in corr.columns]
+    fig_corr = go.Figure(go.Heatmap(
+        z=corr.to_numpy(), x=labels, y=labels,
+        zmin=-1, zmax=1, colorscale="RdBu", reversescale=True
+    ))
+    st.plotly_chart(fig_corr)
+
+# 성능 측정을 켠 경우 이번 재실행 기록을 남기고 사이드바에 보여준다
+show_profile()
@@ -1,16 +1,47 @@
 import streamlit as st
-import matplotlib.pyplot as plt
-import seaborn as sns
+import streamlit.components.v1 as components
 import numpy as np
 import pandas as pd
-import folium
-from streamlit_folium import folium_static
+from utils.density_plot import draw_density, use_density
+from utils.fast_stats import binned_kde, box_stats, histogram, summary
+from utils.figure_cache import FigureCache
+from utils.param_sweep import linear_sweep_html, sine_sweep_html
+from utils.profiler import profile_page, show_profile
+from utils.runtime import lazy_import, use_korean_font
+from utils.spatial_lod import GridPyramid
+from utils.synthetic import SyntheticStore
+
+# 무거운 그래프 라이브러리는 처음 쓸 때 불러온다 (지도 라이브러리는 지도 화면에서만 불러옴)
+plt = lazy_import("matplotlib.pyplot")
+sns = lazy_import("seaborn")
 
 # --- 스트림릿 앱 제목 및 설명 ---
 st.set_page_config(layout="wide") # 넓은 레이아웃 사용
 st.title("🔬 과학 수업 시각화 도우미")
+profile_page("과학 수업 시각화 도우미")
 st.write("다양한 과학 데이터를 시각화하여 개념을 더 쉽게 이해해 보세요!")
 
+# 한글 폰트 및 기본 설정 (폰트 검색 결과는 .cache/font.json에 저장해 두고 다시 쓴다)
+use_korean_font()
+
+# 슬라이더 그래프 PNG 캐시는 모든 세션이 함께 쓴다
+@st.cache_resource
+def get_figure_cache():
+    return FigureCache()
+
+
+# 가상 데이터는 (생성기, 시드, 크기)마다 한 번만 만들어 디스크에 두고 모든 세션이 함께 읽는다
+@st.cache_resource
+def get_synthetic_store():
+    return SyntheticStore()
+
+
+# 슬라이더 조합 전체를 미리 계산한 그래프 HTML (서버 시작 후 한 번만 만든다)
+@st.cache_data
+def get_sweep_html(kind):
+    return linear_sweep_html() if kind == "linear" else sine_sweep_html()
+
+
 st.sidebar.header("📊 시각화 종류 선택")
 visualization_type = st.sidebar.radio(
     "어떤 시각화를 보시겠어요?",
@@ -25,17 +56,36 @@ if visualization_type == "데이터 분포 & 통계":
     st.subheader("가상의 학생 키 데이터 분포")
     st.write("히스토그램과 상자 그림으로 학생들의 키 데이터를 살펴봅니다.")
 
-    # 가상의 데이터 생성
-    np.random.seed(42)
-    student_heights = np.random.normal(loc=170, scale=5, size=200)
-    df_heights = pd.DataFrame({'키 (cm)': student_heights})
+    # 표본 수를 늘려도 빠르도록 히스토그램/KDE/상자 그림 통계는 fast_stats로 직접 계산한다
+    sample_size = st.select_slider(
+        "학생 수 (표본 크기)",
+        options=[200, 10_000, 100_000, 1_000_000, 10_000_000],
+        value=200,
+        format_func=lambda n: f"{n:,}명"
+    )
+
+    # 가상의 데이터 (평균 170, 표준편차 5인 정규분포)
+    student_heights = get_synthetic_store().get("heights", 42, sample_size)["키"]
+
+    counts, edges = histogram(student_heights, bins=20)
+    kde_x, kde_density = binned_kde(student_heights)
+    height_box = box_stats(student_heights, label="")
+    height_summary = summary(student_heights)
+    st.caption(
+        f"표본 {height_summary['표본 수']:,}명 · 평균 {height_summary['평균']:.2f} cm · "
+        f"표준편차 {height_summary['표준편차']:.2f} cm · 이상치 {height_box['n_fliers']:,}명"
+    )
 
     col1, col2 = st.columns(2)
 
     with col1:
         st.write("#### 키 데이터 히스토그램")
         fig_hist, ax_hist = plt.subplots(figsize=(8, 5))
-        sns.histplot(df_heights['키 (cm)'], bins=20, kde=True, ax=ax_hist)
+        color = sns.color_palette()[0]
+        ax_hist.stairs(counts, edges, fill=True, color=color, alpha=0.5)
+        ax_hist.stairs(counts, edges, color="white", linewidth=0.8)
+        # 밀도를 히스토그램 개수 단위로 바꿔 겹쳐 그린다 (seaborn kde=True와 같은 방식)
+        ax_hist.plot(kde_x, kde_density * len(student_heights) * (edges[1] - edges[0]), color=color)
         ax_hist.set_title('학생 키 분포')
         ax_hist.set_xlabel('키 (cm)')
         ax_hist.set_ylabel('학생 수')
@@ -44,7 +94,10 @@ if visualization_type == "데이터 분포 & 통계":
     with col2:
         st.write("#### 키 데이터 상자 그림")
         fig_box, ax_box = plt.subplots(figsize=(8, 5))
-        sns.boxplot(y=df_heights['키 (cm)'], ax=ax_box)
+        ax_box.bxp(
+            [height_box], widths=0.6, patch_artist=True,
+            boxprops={"facecolor": sns.color_palette()[0]}, medianprops={"color": "black"}
+        )
         ax_box.set_title('학생 키 상자 그림')
         ax_box.set_ylabel('키 (cm)')
         st.pyplot(fig_box)
@@ -52,14 +105,24 @@ if visualization_type == "데이터 분포 & 통계":
     st.subheader("두 변수 간의 관계: 온도와 식물 성장률")
     st.write("산점도를 통해 온도와 식물 성장률 사이의 관계를 시각적으로 확인합니다.")
 
-    # 가상의 데이터 생성
-    np.random.seed(29)
-    temperature = np.random.uniform(15, 30, 100)
-    growth_rate = 0.5 * temperature + np.random.normal(0, 2, 100)
-    df_plant = pd.DataFrame({'온도 (°C)': temperature, '성장률 (mm/day)': growth_rate})
+    plant_size = st.select_slider(
+        "측정 횟수",
+        options=[100, 10_000, 100_000, 1_000_000, 5_000_000],
+        value=100,
+        format_func=lambda n: f"{n:,}회"
+    )
+
+    # 가상의 데이터 (성장률 = 0.5 × 온도 + 잡음)
+    plant = get_synthetic_store().get("plant", 29, plant_size)
+    df_plant = pd.DataFrame({'온도 (°C)': plant["온도"], '성장률 (mm/day)': plant["성장률"]}, copy=False)
 
     fig_scatter, ax_scatter = plt.subplots(figsize=(10, 6))
-    sns.scatterplot(x='온도 (°C)', y='성장률 (mm/day)', data=df_plant, ax=ax_scatter)
+    # 점이 많으면 점 하나하나 대신 칸별 점 개수를 색으로 칠한 밀도 이미지로 그린다
+    if use_density(df_plant['온도 (°C)'], df_plant['성장률 (mm/day)']):
+        draw_density(ax_scatter, df_plant['온도 (°C)'], df_plant['성장률 (mm/day)'])
+        st.caption(f"측정값이 {plant_size:,}개라 점 대신 밀도(칸별 점 개수)로 표시합니다.")
+    else:
+        sns.scatterplot(x='온도 (°C)', y='성장률 (mm/day)', data=df_plant, ax=ax_scatter)
     ax_scatter.set_title('온도와 식물 성장률 관계')
     ax_scatter.set_xlabel('온도 (°C)')
     ax_scatter.set_ylabel('성장률 (mm/day)')
@@ -71,58 +134,98 @@ elif visualization_type == "함수 그래프 그리기":
     st.header("2. 함수 그래프 그리기")
     st.markdown("---")
 
+    # 여러 명이 동시에 슬라이더를 움직이면 서버가 매번 다시 그리느라 느려진다.
+    # 브라우저 모드는 모든 조합을 미리 계산해 보내고 슬라이더를 브라우저에서만 처리한다.
+    graph_mode = st.radio(
+        "그래프 조작 방식",
+        ("서버에서 그리기", "브라우저에서 바로 보기 (미리 계산)"),
+        horizontal=True
+    )
+    client_side = graph_mode != "서버에서 그리기"
+
     st.subheader("1차 함수 $y = ax + b$ 그리기")
     st.write("슬라이더를 움직여 $a$와 $b$ 값에 따라 그래프가 어떻게 변하는지 관찰해 보세요.")
 
-    col3, col4 = st.columns(2)
-
-    with col3:
-        a = st.slider("기울기 (a)", -5.0, 5.0, 1.0, 0.1)
-    with col4:
-        b = st.slider("y 절편 (b)", -10.0, 10.0, 0.0, 0.5)
-
-    x = np.linspace(-10, 10, 400)
-    y = a * x + b
-
-    fig_linear, ax_linear = plt.subplots(figsize=(10, 6))
-    ax_linear.plot(x, y, label=f'y = {a}x + {b}')
-    ax_linear.set_title(f'1차 함수: y = {a}x + {b}')
-    ax_linear.set_xlabel('x')
-    ax_linear.set_ylabel('y')
-    ax_linear.grid(True)
-    ax_linear.axhline(0, color='grey', linewidth=0.8)
-    ax_linear.axvline(0, color='grey', linewidth=0.8)
-    ax_linear.legend()
-    st.pyplot(fig_linear)
+    if client_side:
+        components.html(get_sweep_html("linear"), height=560)
+    else:
+        col3, col4 = st.columns(2)
+
+        with col3:
+            a = st.slider("기울기 (a)", -5.0, 5.0, 1.0, 0.1)
+        with col4:
+            b = st.slider("y 절편 (b)", -10.0, 10.0, 0.0, 0.5)
+
+        # 같은 (a, b)로 그린 적이 있으면 캐시해 둔 PNG를 바로 보여준다
+        def draw_linear(figsize):
+            x = np.linspace(-10, 10, 400)
+            y = a * x + b
+
+            fig_linear, ax_linear = plt.subplots(figsize=figsize)
+            ax_linear.plot(x, y, label=f'y = {a}x + {b}')
+            ax_linear.set_title(f'1차 함수: y = {a}x + {b}')
+            ax_linear.set_xlabel('x')
+            ax_linear.set_ylabel('y')
+            ax_linear.grid(True)
+            ax_linear.axhline(0, color='grey', linewidth=0.8)
+            ax_linear.axvline(0, color='grey', linewidth=0.8)
+            ax_linear.legend()
+            return fig_linear
+
+        figure_cache = get_figure_cache()
+        st.image(figure_cache.get_or_render("linear", (a, b), (10, 6), draw_linear), use_container_width=True)
 
     st.subheader("사인(sine) 파동 $y = A \sin(kx + \phi)$ 그리기")
     st.write("진폭, 파수, 위상에 따른 파동의 변화를 시각적으로 확인합니다.")
 
-    col5, col6, col7 = st.columns(3)
-    with col5:
-        amplitude = st.slider("진폭 (A)", 0.1, 5.0, 1.0, 0.1)
-    with col6:
-        k_val = st.slider("파수 (k)", 0.1, 5.0, 1.0, 0.1)
-    with col7:
-        phase = st.slider("위상 (φ)", -np.pi, np.pi, 0.0, 0.1)
-
-    x_wave = np.linspace(-2 * np.pi, 2 * np.pi, 500)
-    y_wave = amplitude * np.sin(k_val * x_wave + phase)
-
-    fig_wave, ax_wave = plt.subplots(figsize=(10, 6))
-    ax_wave.plot(x_wave, y_wave, label=f'y = {amplitude}sin({k_val}x + {phase:.2f})')
-    ax_wave.set_title(f'사인 파동: A={amplitude}, k={k_val}, φ={phase:.2f}')
-    ax_wave.set_xlabel('x')
-    ax_wave.set_ylabel('y')
-    ax_wave.grid(True)
-    ax_wave.axhline(0, color='grey', linewidth=0.8)
-    ax_wave.axvline(0, color='grey', linewidth=0.8)
-    ax_wave.legend()
-    st.pyplot(fig_wave)
+    if client_side:
+        components.html(get_sweep_html("sine"), height=560)
+    else:
+        col5, col6, col7 = st.columns(3)
+        with col5:
+            amplitude = st.slider("진폭 (A)", 0.1, 5.0, 1.0, 0.1)
+        with col6:
+            k_val = st.slider("파수 (k)", 0.1, 5.0, 1.0, 0.1)
+        with col7:
+            phase = st.slider("위상 (φ)", -np.pi, np.pi, 0.0, 0.1)
+
+        def draw_wave(figsize):
+            x_wave = np.linspace(-2 * np.pi, 2 * np.pi, 500)
+            y_wave = amplitude * np.sin(k_val * x_wave + phase)
+
+            fig_wave, ax_wave = plt.subplots(figsize=figsize)
+            ax_wave.plot(x_wave, y_wave, label=f'y = {amplitude}sin({k_val}x + {phase:.2f})')
+            ax_wave.set_title(f'사인 파동: A={amplitude}, k={k_val}, φ={phase:.2f}')
+            ax_wave.set_xlabel('x')
+            ax_wave.set_ylabel('y')
+            ax_wave.grid(True)
+            ax_wave.axhline(0, color='grey', linewidth=0.8)
+            ax_wave.axvline(0, color='grey', linewidth=0.8)
+            ax_wave.legend()
+            return fig_wave
+
+        st.image(
+            figure_cache.get_or_render("sine", (amplitude, k_val, phase), (10, 6), draw_wave),
+            use_container_width=True
+        )
+
+        # 캐시 크기를 정할 수 있도록 적중/실패 횟수를 보여준다
+        with st.sidebar.expander("그래프 캐시 통계"):
+            cache_stats = figure_cache.stats()
+            st.write(
+                f"적중 {cache_stats['적중']:,}회 · 실패 {cache_stats['실패']:,}회 "
+                f"(적중률 {cache_stats['적중률']:.0%})"
+            )
+            st.write(f"{cache_stats['항목 수']:,}개 · {cache_stats['용량 (MB)']:.1f} MB")
 
 
 # --- 3. 인터랙티브 지도 시각화 (Folium) ---
 elif visualization_type == "인터랙티브 지도":
+    import folium
+    from folium.plugins import HeatMap
+    from streamlit_folium import folium_static, st_folium
+    from utils.map_layers import add_circle_layer, add_grid_layer
+
     st.header("3. 인터랙티브 지도 시각화")
     st.markdown("---")
 
@@ -155,27 +258,93 @@ elif visualization_type == "인터랙티브 지도":
     st.subheader("지진 발생 위치 시각화 (가상 데이터)")
     st.write("전 세계 지진 발생 빈도가 높은 지역을 시각적으로 나타냅니다. 원의 크기는 지진의 강도를 나타냅니다.")
 
-    # 가상의 지진 데이터 생성
-    np.random.seed(100)
-    num_earthquakes = 200
-    eq_data = pd.DataFrame({
-        'lat': np.random.uniform(-60, 80, num_earthquakes),
-        'lon': np.random.uniform(-180, 180, num_earthquakes),
-        'magnitude': np.random.uniform(2, 7, num_earthquakes)
-    })
+    col_n, col_cluster = st.columns(2)
+    with col_n:
+        num_earthquakes = st.select_slider("지진 데이터 개수", [200, 1_000, 10_000, 100_000], value=200)
+    with col_cluster:
+        use_cluster = st.checkbox("가까운 지진 묶어서 보기 (클러스터)", value=num_earthquakes > 10_000)
+
+    # 가상의 지진 데이터 (위도, 경도, 규모)
+    eq_data = pd.DataFrame(get_synthetic_store().get("earthquakes", 100, num_earthquakes), copy=False)
 
     # 지진 지도 생성
     m_eq = folium.Map(location=[0, 0], zoom_start=2)
 
-    for idx, row in eq_data.iterrows():
-        folium.CircleMarker(
-            location=[row['lat'], row['lon']],
-            radius=row['magnitude'] * 1.5, # 강도에 따라 원 크기 조절
-            color='red',
-            fill=True,
-            fill_color='red',
-            fill_opacity=0.6,
-            popup=f"Magnitude: {row['magnitude']:.1f}"
-        ).add_to(m_eq)
+    # 모든 지진을 배열 하나로 보내고 브라우저에서 원을 만든다 (강도에 따라 원 크기/색 조절)
+    add_circle_layer(
+        m_eq, eq_data['lat'], eq_data['lon'], eq_data['magnitude'],
+        cluster=use_cluster, radius_scale=1.5
+    )
 
     folium_static(m_eq, width=900, height=600)
+
+    st.subheader("대용량 지진 카탈로그 (확대 수준별 집계)")
+    st.write("점이 많을 때는 격자로 미리 집계한 값을 보여주고, 확대해서 화면 안의 지진이 충분히 적어지면 개별 지진을 표시합니다.")
+
+    # 전 세계 지진 카탈로그 CSV (예: USGS의 latitude, longitude, mag 열)를 올리거나 가상 데이터 사용
+    catalog_file = st.file_uploader("지진 카탈로그 CSV (latitude, longitude, mag 열)", type=["csv"])
+    col_size, col_mode = st.columns(2)
+    with col_size:
+        catalog_size = st.select_slider(
+            "가상 지진 데이터 개수", [10_000, 100_000, 1_000_000, 5_000_000], value=100_000,
+            disabled=catalog_file is not None
+        )
+    with col_mode:
+        lod_style = st.radio("집계 표시 방식", ("히트맵", "격자 (최대 규모)"), horizontal=True)
+
+    @st.cache_resource
+    def get_catalog_pyramid(csv_bytes, size):
+        if csv_bytes is not None:
+            import io
+            catalog = pd.read_csv(io.BytesIO(csv_bytes), usecols=["latitude", "longitude", "mag"]).dropna()
+            return GridPyramid(catalog["latitude"], catalog["longitude"], catalog["mag"])
+        synthetic = get_synthetic_store().get("earthquakes", 100, size)
+        return GridPyramid(synthetic["lat"], synthetic["lon"], synthetic["magnitude"])
+
+    try:
+        pyramid = get_catalog_pyramid(catalog_file.getvalue() if catalog_file else None, catalog_size)
+    except (ValueError, KeyError) as e:
+        st.error(f"카탈로그 CSV를 읽는 중 오류가 발생했습니다: {e}")
+        st.stop()
+
+    # 직전 화면 위치(중심, 확대 수준, 범위)를 기억해 두었다가 그 범위의 데이터만 보낸다
+    view = st.session_state.setdefault("eq_lod_view", {
+        "center": [20, 0], "zoom": 2, "bounds": (-90.0, -180.0, 90.0, 180.0)
+    })
+    kind, selected = pyramid.query(view["bounds"], view["zoom"])
+
+    m_lod = folium.Map(location=view["center"], zoom_start=view["zoom"])
+    if kind == "points":
+        add_circle_layer(m_lod, pyramid.lat[selected], pyramid.lon[selected], pyramid.values[selected])
+        st.caption(f"화면 안 지진 {len(selected):,}개를 개별 표시합니다.")
+    else:
+        level = pyramid.level_for_zoom(view["zoom"])
+        if lod_style == "히트맵":
+            weights = selected["count"] / max(selected["count"].max(), 1)
+            HeatMap(np.column_stack([selected["lat"], selected["lon"], weights]).tolist(), radius=20).add_to(m_lod)
+        else:
+            add_grid_layer(m_lod, selected, level.cell_size)
+        st.caption(
+            f"화면 안 지진 {int(selected['count'].sum()):,}개를 {level.cell_size:g}° 격자 "
+            f"{len(selected['count']):,}칸으로 집계해 표시합니다. 더 확대하면 개별 지진이 보입니다."
+        )
+
+    lod_state = st_folium(
+        m_lod, width=900, height=600, key="eq_lod_map",
+        returned_objects=["bounds", "zoom", "center"]
+    )
+    # (center는 브라우저에서 지도가 실제로 그려진 뒤에만 돌아온다)
+    if lod_state and lod_state.get("center") and lod_state["bounds"].get("_southWest"):
+        sw, ne = lod_state["bounds"]["_southWest"], lod_state["bounds"]["_northEast"]
+        new_view = {
+            "center": [lod_state["center"]["lat"], lod_state["center"]["lng"]],
+            "zoom": lod_state["zoom"],
+            "bounds": (sw["lat"], sw["lng"], ne["lat"], ne["lng"]),
+        }
+        # 지도를 움직여 범위가 바뀌었을 때만 다시 그린다
+        if new_view["bounds"] != view["bounds"] or new_view["zoom"] != view["zoom"]:
+            st.session_state["eq_lod_view"] = new_view
+            st.rerun()
+
+# 성능 측정을 켠 경우 이번 재실행 기록을 남기고 사이드바에 보여준다
+show_profile()
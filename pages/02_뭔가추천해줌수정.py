@@ -1,60 +1,30 @@
 import streamlit as st
-import matplotlib.pyplot as plt
-import seaborn as sns
 import numpy as np
 import pandas as pd
-import folium
-from streamlit_folium import folium_static
-import platform
-import matplotlib.font_manager as fm
+from utils.profiler import profile_page, show_profile
+from utils.runtime import lazy_import, use_korean_font
 
-# --- Matplotlib 한글 폰트 및 기본 설정 ---
-def set_matplotlib_font_and_defaults():
-    # 기본 Figure 크기 설정 (화면 절반 정도를 목표로)
-    # Streamlit의 "wide" 레이아웃에서 8x5는 대략 절반 정도에 가깝습니다.
-    # 사용자의 화면 해상도에 따라 조절할 수 있습니다.
-    plt.rcParams["figure.figsize"] = (8, 5)
-
-    # 마이너스 기호 깨짐 방지
-    plt.rcParams['axes.unicode_minus'] = False
-
-    # 운영체제별 폰트 설정
-    if platform.system() == 'Darwin':  # macOS
-        plt.rcParams['font.family'] = 'AppleGothic'
-    elif platform.system() == 'Windows':  # Windows
-        plt.rcParams['font.family'] = 'Malgun Gothic'
-    elif platform.system() == 'Linux':    # Linux (나눔고딕 선호)
-        try:
-            fm.findfont(fm.FontProperties(name='NanumGothic'))
-            plt.rcParams['font.family'] = 'NanumGothic'
-        except:
-            # 나눔고딕이 없으면 기본 폰트 사용 (한글 깨질 수 있음)
-            st.warning("리눅스 환경에서 'NanumGothic' 폰트를 찾을 수 없습니다. "
-                       "폰트가 깨져 보일 수 있습니다. 'sudo apt-get install fonts-nanum' 등으로 설치해 주세요.")
-    else:
-        # 기타 OS (폰트 설정 없음)
-        pass
-
-# 폰트 및 기본 설정 함수 호출 (앱 시작 시 한 번만 실행)
-set_matplotlib_font_and_defaults()
+# 무거운 그래프 라이브러리는 처음 쓸 때 불러온다
+plt = lazy_import("matplotlib.pyplot")
+sns = lazy_import("seaborn")
 
 
 # --- 스트림릿 앱 제목 및 설명 ---
 st.set_page_config(layout="wide") # 넓은 레이아웃 사용
 st.title("🔬 과학 수업 시각화 도우미")
+profile_page("과학 수업 시각화 도우미 (수정)")
 st.write("다양한 과학 데이터를 시각화하여 개념을 더 쉽게 이해해 보세요!")
 
+# 한글 폰트 및 기본 설정 (폰트 검색 결과는 .cache/font.json에 저장해 두고 다시 쓴다)
+use_korean_font()
+
 st.sidebar.header("📊 시각화 종류 선택")
 visualization_type = st.sidebar.radio(
     "어떤 시각화를 보시겠어요?",
     ("데이터 분포 & 통계", "함수 그래프 그리기", "인터랙티브 지도")
 )
 
----
-
-### 1. 데이터 분포 & 통계 시각화
-
-```python
+# --- 1. 데이터 분포 & 통계 시각화 ---
 if visualization_type == "데이터 분포 & 통계":
     st.header("1. 데이터 분포 및 통계 시각화")
     st.markdown("---")
@@ -107,3 +77,6 @@ if visualization_type == "데이터 분포 & 통계":
     ax_scatter.set_ylabel('성장률 (mm/day)')
     st.pyplot(fig_scatter)
     plt.close(fig_scatter) # 메모리 해제
+
+# 성능 측정을 켠 경우 이번 재실행 기록을 남기고 사이드바에 보여준다
+show_profile()
@@ -1,19 +1,36 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
+from utils.bar_aggregate import STATS, aggregate_bars, draw_bars
+from utils.density_plot import draw_density, use_density
+from utils.profiler import profile_page, show_profile
+from utils.runtime import lazy_import, use_korean_font
+from utils.upload import column_histogram, load_uploaded_workbook, show_column_stats, show_memory_report, show_preview
+
+# 무거운 그래프 라이브러리는 그래프를 실제로 그릴 때 불러온다
+plt = lazy_import("matplotlib.pyplot")
+sns = lazy_import("seaborn")
 
 st.title("엑셀 데이터 업로드 후 그래프 변환 앱")
+profile_page("엑셀 업로드 그래프")
+
+# 한글 폰트 및 기본 설정
+use_korean_font()
 
 # 파일 업로드
 uploaded_file = st.file_uploader("엑셀 파일을 업로드하세요", type=["xlsx", "xls"])
+max_rows = st.sidebar.number_input("최대 읽을 행 수 (0 = 제한 없음)", min_value=0, value=1_000_000, step=100_000)
 
 if uploaded_file:
-    # 엑셀 데이터 읽기
-    df = pd.read_excel(uploaded_file)
-    st.write("업로드된 데이터 미리보기:")
-    st.dataframe(df.head())
+    # 엑셀 데이터 읽기 (시트가 여러 개면 작업 프로세스들에서 동시에 읽고 시트를 고른다)
+    dataset = load_uploaded_workbook(uploaded_file, max_rows=max_rows or None)
+    df = dataset.df
+    st.write("업로드된 데이터 미리보기 (정렬·필터·페이지 이동은 서버에서 처리):")
+    show_preview(dataset)
+    show_memory_report(dataset)
+    show_column_stats(dataset)
+    # 열 선택지, 막대 구간, 히스토그램 구간, 축 범위는 업로드할 때 만든 열 통계에서 읽는다
+    columns = dataset.column_index
 
     # 간단한 데이터 확인 및 그래프
     st.write("데이터 컬럼:", list(df.columns))
@@ -22,24 +39,45 @@ if uploaded_file:
     graph_type = st.selectbox("그래프 종류를 선택하세요", ["막대그래프", "선그래프", "히스토그램"])
 
     # 그래프에 쓸 컬럼 선택 (숫자형만)
-    numeric_cols = df.select_dtypes(include=np.number).columns.tolist()
+    numeric_cols = columns.numeric_columns()
     if numeric_cols:
         x_col = st.selectbox("X축 컬럼 선택", numeric_cols)
         y_col = st.selectbox("Y축 컬럼 선택", numeric_cols)
+        if graph_type == "막대그래프":
+            stat = st.selectbox("막대 집계 방식", list(STATS.keys()))
+            show_ci = st.checkbox("95% 신뢰구간 표시", value=True)
 
-        fig, ax = plt.subplots()
-        sns.set_style("whitegrid")
+        # 값이 하나도 없는(전부 빈 값/무한대) 열은 히스토그램 구간을 정할 수 없다
+        histogram = column_histogram(dataset, x_col) if graph_type == "히스토그램" else None
+        if graph_type == "히스토그램" and histogram is None:
+            st.warning(f"'{x_col}' 컬럼에 값이 없어 히스토그램을 그릴 수 없습니다.")
+        else:
+            fig, ax = plt.subplots()
+            sns.set_style("whitegrid")
 
-        if graph_type == "막대그래프":
-            sns.barplot(x=df[x_col], y=df[y_col], ax=ax, palette="pastel")
-        elif graph_type == "선그래프":
-            sns.lineplot(x=df[x_col], y=df[y_col], ax=ax, marker="o", color="coral")
-        elif graph_type == "히스토그램":
-            ax.hist(df[x_col], bins=15, color="skyblue", edgecolor="black")
-            ax.set_xlabel(x_col)
-            ax.set_ylabel("Frequency")
-
-        st.pyplot(fig)
+            if graph_type == "막대그래프":
+                # 원본 행 대신 미리 집계한 작은 표로 막대를 그린다 (숫자형 X는 구간으로 나눔)
+                table = aggregate_bars(df[x_col], df[y_col], stat=STATS[stat], ci=show_ci,
+                                       distinct=columns.distinct(x_col), value_range=columns.value_range(x_col))
+                draw_bars(ax, table)
+            elif graph_type == "선그래프":
+                # 행이 아주 많으면 점/선 대신 밀도 이미지로 그린다 (PNG 크기와 그리는 시간이 행 수와 무관)
+                if use_density(df[x_col], df[y_col]):
+                    draw_density(ax, df[x_col], df[y_col], cmap="OrRd",
+                                 limits=(columns.value_range(x_col), columns.value_range(y_col)))
+                    st.caption(f"행이 {len(df):,}개라 선 대신 밀도(칸별 점 개수)로 표시합니다.")
+                else:
+                    sns.lineplot(x=df[x_col], y=df[y_col], ax=ax, marker="o", color="coral")
+                    ax.set_xlim(columns.axis_limits(x_col))
+                    ax.set_ylim(columns.axis_limits(y_col))
+            elif graph_type == "히스토그램":
+                # 구간은 열 통계로 정하고, 칸별 개수는 데이터셋/열마다 한 번만 센 것을 그린다
+                counts, edges = histogram
+                ax.hist(edges[:-1], bins=edges, weights=counts, color="skyblue", edgecolor="black")
+                ax.set_xlabel(x_col)
+                ax.set_ylabel("Frequency")
+
+            st.pyplot(fig)
     else:
         st.warning("숫자형 컬럼이 데이터에 없습니다.")
 
@@ -65,3 +103,6 @@ if st.button("가상 데이터로 그래프 보기"):
     ax2.set_xlabel("날짜")
     plt.xticks(rotation=45)
     st.pyplot(fig2)
+
+# 성능 측정을 켠 경우 이번 재실행 기록을 남기고 사이드바에 보여준다
+show_profile()
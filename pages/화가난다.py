@@ -1,58 +1,41 @@
 import streamlit as st
 import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-import platform
-import matplotlib.font_manager as fm
+from utils.bar_aggregate import STATS, aggregate_bars, draw_bars
+from utils.density_plot import draw_density, use_density
+from utils.profiler import profile_page, show_profile
+from utils.runtime import lazy_import, use_korean_font
+from utils.upload import column_histogram, load_uploaded_workbook, show_column_stats, show_memory_report, show_preview
 
-# --- Matplotlib 한글 폰트 및 기본 설정 ---
-def set_matplotlib_font_and_defaults():
-    # 기본 Figure 크기 설정 (Streamlit wide 레이아웃에서 적절한 크기)
-    plt.rcParams["figure.figsize"] = (8, 5)
-
-    # 마이너스 기호 깨짐 방지
-    plt.rcParams['axes.unicode_minus'] = False
-
-    # 운영체제별 폰트 설정
-    if platform.system() == 'Darwin':  # macOS
-        plt.rcParams['font.family'] = 'AppleGothic'
-    elif platform.system() == 'Windows':  # Windows
-        plt.rcParams['font.family'] = 'Malgun Gothic'
-    elif platform.system() == 'Linux':    # Linux (나눔고딕 선호)
-        try:
-            fm.findfont(fm.FontProperties(name='NanumGothic'))
-            plt.rcParams['font.family'] = 'NanumGothic'
-        except:
-            st.warning("리눅스 환경에서 'NanumGothic' 폰트를 찾을 수 없습니다. "
-                       "폰트가 깨져 보일 수 있습니다. 'sudo apt-get install fonts-nanum' 등으로 설치해 주세요.")
-    else:
-        # 기타 OS (폰트 설정 없음)
-        pass
-
-# 폰트 및 기본 설정 함수 호출 (앱 시작 시 한 번만 실행)
-set_matplotlib_font_and_defaults()
+# 무거운 그래프 라이브러리는 그래프를 실제로 그릴 때 불러온다
+plt = lazy_import("matplotlib.pyplot")
+sns = lazy_import("seaborn")
 
 # --- 스트림릿 앱 제목 및 레이아웃 설정 ---
 st.set_page_config(layout="wide") # 넓은 레이아웃 사용
 st.title("📊 엑셀 데이터 업로드 후 그래프 변환 앱")
+profile_page("엑셀 업로드 그래프 (wide)")
 st.write("엑셀 파일을 업로드하여 데이터를 시각화하고, 가상 데이터로도 그래프를 만들어볼 수 있습니다.")
 
----
-
-## 엑셀 파일 업로드 및 시각화
+# 한글 폰트 및 기본 설정 (폰트 검색 결과는 .cache/font.json에 저장해 두고 다시 쓴다)
+use_korean_font()
 
-```python
+# --- 엑셀 파일 업로드 및 시각화 ---
 # 파일 업로드
 uploaded_file = st.file_uploader("엑셀 파일을 업로드하세요", type=["xlsx", "xls"])
+max_rows = st.sidebar.number_input("최대 읽을 행 수 (0 = 제한 없음)", min_value=0, value=1_000_000, step=100_000)
 
 if uploaded_file:
-    # 엑셀 데이터 읽기
+    # 엑셀 데이터 읽기 (시트가 여러 개면 작업 프로세스들에서 동시에 읽고 시트를 고른다)
     try:
-        df = pd.read_excel(uploaded_file)
+        dataset = load_uploaded_workbook(uploaded_file, max_rows=max_rows or None)
+        df = dataset.df
         st.write("---")
         st.subheader("업로드된 데이터 미리보기:")
-        st.dataframe(df.head())
+        show_preview(dataset)
+        show_memory_report(dataset)
+        show_column_stats(dataset)
+        # 열 선택지, 막대 구간, 히스토그램 구간, 축 범위는 업로드할 때 만든 열 통계에서 읽는다
+        columns = dataset.column_index
 
         # 데이터 컬럼 확인
         st.write("---")
@@ -63,7 +46,7 @@ if uploaded_file:
         graph_type = st.selectbox("그래프 종류를 선택하세요", ["막대그래프", "선그래프", "히스토그램"])
 
         # 그래프에 쓸 숫자형 컬럼 선택
-        numeric_cols = df.select_dtypes(include=np.number).columns.tolist()
+        numeric_cols = columns.numeric_columns()
         
         if not numeric_cols: # 숫자형 컬럼이 없는 경우
             st.warning("업로드된 데이터에 숫자형 컬럼이 없습니다. 그래프를 그릴 수 없습니다.")
@@ -80,6 +63,9 @@ if uploaded_file:
                      st.warning("Y축으로 사용할 숫자형 컬럼이 없습니다.")
                 else:
                     y_col = st.selectbox("Y축 컬럼 선택", y_col_options)
+                    if graph_type == "막대그래프":
+                        stat = st.selectbox("막대 집계 방식", list(STATS.keys()))
+                        show_ci = st.checkbox("95% 신뢰구간 표시", value=True)
 
                     if x_col and y_col:
                         fig, ax = plt.subplots() # 기본 figsize (8,5) 적용
@@ -87,14 +73,23 @@ if uploaded_file:
 
                         try:
                             if graph_type == "막대그래프":
-                                # 데이터가 많을 경우 X축 레이블 겹침 방지
-                                if df[x_col].nunique() > 10 and df[x_col].dtype == 'object': # 범주형이면서 종류가 많을 때
-                                    sns.barplot(x=df[x_col], y=df[y_col], ax=ax, palette="pastel")
-                                    ax.tick_params(axis='x', rotation=45)
-                                else:
-                                    sns.barplot(x=df[x_col], y=df[y_col], ax=ax, palette="pastel")
+                                # 원본 행 대신 미리 집계한 작은 표로 막대를 그린다
+                                # (숫자형 X는 구간으로 나누고, 종류가 많은 범주는 상위 N개 + 기타로 묶음,
+                                #  막대가 많으면 X축 레이블 겹침 방지를 위해 회전)
+                                table = aggregate_bars(df[x_col], df[y_col], stat=STATS[stat], ci=show_ci,
+                                                       distinct=columns.distinct(x_col), value_range=columns.value_range(x_col))
+                                draw_bars(ax, table)
                             elif graph_type == "선그래프":
-                                sns.lineplot(x=df[x_col], y=df[y_col], ax=ax, marker="o", color="coral")
+                                # 행이 아주 많으면 점/선 대신 밀도 이미지로 그린다 (PNG 크기와 그리는 시간이 행 수와 무관)
+                                if use_density(df[x_col], df[y_col]):
+                                    draw_density(ax, df[x_col], df[y_col], cmap="OrRd",
+                                                 limits=(columns.value_range(x_col), columns.value_range(y_col)))
+                                    st.caption(f"행이 {len(df):,}개라 선 대신 밀도(칸별 점 개수)로 표시합니다.")
+                                else:
+                                    sns.lineplot(x=df[x_col], y=df[y_col], ax=ax, marker="o", color="coral")
+                                    # 축 범위는 열 통계의 최솟값/최댓값으로 (숫자/날짜가 아닌 X는 None이라 그대로)
+                                    ax.set_xlim(columns.axis_limits(x_col))
+                                    ax.set_ylim(columns.axis_limits(y_col))
                                 # X축이 날짜/시간 타입일 경우 회전
                                 if pd.api.types.is_datetime64_any_dtype(df[x_col]):
                                     plt.xticks(rotation=45)
@@ -118,11 +113,18 @@ if uploaded_file:
                 else:
                     hist_col = st.selectbox("히스토그램 컬럼 선택", hist_col_options)
                     
-                    if hist_col:
+                    # 구간은 열 통계로 정하고(값 종류가 적은 정수 열은 값마다 한 칸),
+                    # 칸별 개수는 데이터셋/열마다 한 번만 센 것을 그린다
+                    histogram = column_histogram(dataset, hist_col) if hist_col else None
+                    if hist_col and histogram is None:
+                        # 값이 하나도 없는(전부 빈 값/무한대) 열은 구간을 정할 수 없다
+                        st.warning(f"'{hist_col}' 컬럼에 값이 없어 히스토그램을 그릴 수 없습니다.")
+                    elif hist_col:
                         fig, ax = plt.subplots() # 기본 figsize (8,5) 적용
                         sns.set_style("whitegrid")
                         
-                        ax.hist(df[hist_col], bins=15, color="skyblue", edgecolor="black")
+                        counts, edges = histogram
+                        ax.hist(edges[:-1], bins=edges, weights=counts, color="skyblue", edgecolor="black")
                         ax.set_title(f"{hist_col} 분포 히스토그램")
                         ax.set_xlabel(hist_col)
                         ax.set_ylabel("빈도 (Frequency)")
@@ -131,3 +133,6 @@ if uploaded_file:
 
     except Exception as e:
         st.error(f"엑셀 파일을 읽는 중 오류가 발생했습니다. 파일 형식이나 내용이 올바른지 확인해 주세요: {e}")
+
+# 성능 측정을 켠 경우 이번 재실행 기록을 남기고 사이드바에 보여준다
+show_profile()
@@ -0,0 +1,41 @@
+"""read_excel_streaming이 빈 행/빈 열을 pd.read_excel과 같게 읽는지 확인한다."""
+import datetime as dt
+
+import pandas as pd
+import pytest
+from openpyxl import Workbook
+
+from utils.excel_stream import read_excel_streaming
+
+
+@pytest.fixture
+def workbook_path(tmp_path):
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(["숫자", "글자", "빈 열", "날짜"])
+    sheet.append([1, "x", None, dt.datetime(2024, 1, 1)])
+    sheet.append([None, None, None, None])
+    sheet.append([2, "y", None, dt.datetime(2024, 1, 2)])
+    for _ in range(6):
+        sheet.append([None, None, None, None])
+    sheet.append([3, None, None, None])
+    # 시트 끝의 빈 행 (서식만 있는 셀)
+    sheet.cell(row=20, column=1).number_format = "0.00"
+    path = tmp_path / "blank.xlsx"
+    workbook.save(path)
+    return path
+
+
+@pytest.mark.parametrize("chunk_rows", [2, 3, 5000])
+def test_blank_rows_and_columns_match_read_excel(workbook_path, chunk_rows):
+    expected = pd.read_excel(workbook_path)
+    with open(workbook_path, "rb") as f:
+        actual = read_excel_streaming(f, chunk_rows=chunk_rows)
+    pd.testing.assert_frame_equal(actual, expected)
+
+
+def test_max_rows_counts_blank_rows(workbook_path):
+    expected = pd.read_excel(workbook_path, nrows=3)
+    with open(workbook_path, "rb") as f:
+        actual = read_excel_streaming(f, chunk_rows=2, max_rows=3)
+    pd.testing.assert_frame_equal(actual, expected)
@@ -0,0 +1,130 @@
+"""ThumbnailCache 테스트. 외부 사이트 대신 로컬 HTTP 대체 서버에서 사진을 받는다."""
+import io
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from PIL import Image
+
+from utils.image_cache import ThumbnailCache
+
+
+def _png(size=(1600, 1200), color="#3366cc"):
+    buffer = io.BytesIO()
+    Image.new("RGB", size, color).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # /photo/<이름>: PNG, /slow/<이름>: gate가 열릴 때까지 기다렸다가 PNG, 그 밖에는 404
+    def do_GET(self):
+        self.server.requests.append(self.path)
+        if self.path.startswith("/slow/"):
+            self.server.gate.wait(5)
+        if self.path.startswith(("/photo/", "/slow/")):
+            body = _png()
+            self.send_response(200)
+            self.send_header("Content-Type", "image/png")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        else:
+            self.send_error(404)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    httpd.requests = []
+    httpd.gate = threading.Event()
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.gate.set()
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _url(server, path):
+    return f"http://127.0.0.1:{server.server_address[1]}{path}"
+
+
+def _wait_idle(cache, urls, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while any(cache.loading(url) for url in urls):
+        assert time.monotonic() < deadline, "썸네일을 제한 시간 안에 받지 못했습니다"
+        time.sleep(0.01)
+
+
+def test_get_returns_immediately_while_download_is_pending(tmp_path, server):
+    cache = ThumbnailCache(root=tmp_path, timeout=5.0)
+    url = _url(server, "/slow/castle.jpg")
+
+    started = time.monotonic()
+    assert cache.get(url) is None
+    assert time.monotonic() - started < 1.0
+    assert cache.loading(url)
+
+    # 받기가 끝나면 다음 재실행(get)에서 파일을 돌려준다
+    server.gate.set()
+    _wait_idle(cache, [url])
+    path = cache.get(url)
+    assert path == cache.path_for(url)
+    with Image.open(path) as image:
+        assert image.format == "WEBP"
+        assert image.size[0] <= 640 and image.size[1] <= 480
+
+
+def test_prefetch_downloads_each_photo_once(tmp_path, server):
+    cache = ThumbnailCache(root=tmp_path)
+    urls = [_url(server, f"/photo/{i}.jpg") for i in range(6)]
+
+    cache.prefetch(urls)
+    cache.prefetch(urls)
+    _wait_idle(cache, urls)
+    assert all(cache.get(url) is not None for url in urls)
+    assert sorted(server.requests) == sorted(f"/photo/{i}.jpg" for i in range(6))
+
+
+def test_failed_photo_is_not_retried_until_retry_after(tmp_path, server):
+    cache = ThumbnailCache(root=tmp_path, retry_after=60.0)
+    url = _url(server, "/missing.jpg")
+
+    assert cache.get(url) is None
+    _wait_idle(cache, [url])
+    assert cache.get(url) is None
+    assert not cache.loading(url)
+    assert server.requests == ["/missing.jpg"]
+
+    # retry_after가 지나면 다시 시도한다
+    cache.retry_after = 0.0
+    cache.get(url)
+    _wait_idle(cache, [url])
+    assert server.requests == ["/missing.jpg", "/missing.jpg"]
+
+
+def test_disk_cache_keeps_recently_used_thumbnails_within_max_bytes(tmp_path, server):
+    urls = [_url(server, f"/photo/{i}.jpg") for i in range(4)]
+    probe = ThumbnailCache(root=tmp_path / "probe")
+    probe.prefetch(urls[:1])
+    _wait_idle(probe, urls[:1])
+    size = probe.path_for(urls[0]).stat().st_size
+
+    # 썸네일 두 장 반 크기로 제한하면 가장 오래 안 쓴 것부터 지워진다
+    cache = ThumbnailCache(root=tmp_path / "cache", max_bytes=int(size * 2.5))
+    for url in urls[:2]:
+        cache.prefetch([url])
+        _wait_idle(cache, [url])
+        time.sleep(0.02)
+    cache.get(urls[0])      # 0번을 최근에 쓴 것으로
+    time.sleep(0.02)
+    cache.prefetch([urls[2]])
+    _wait_idle(cache, [urls[2]])
+
+    assert cache.path_for(urls[0]).exists()
+    assert not cache.path_for(urls[1]).exists()
+    assert cache.path_for(urls[2]).exists()
@@ -0,0 +1,136 @@
+"""PriceStore / PriceEngine 테스트. yfinance 대신 호출을 기록하는 로컬 fetcher를 넣는다."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils import price_store
+from utils.fetch_scheduler import FetchResult
+from utils.price_matrix import PriceEngine
+from utils.price_store import DownloadError, PriceStore
+
+
+class FakeFetcher:
+    # 평일마다 한 행씩 만들어 주고, 받은 (티커, 시작, 끝)을 calls에 남긴다
+    def __init__(self, fail=()):
+        self.calls = []
+        self.fail = set(fail)
+
+    def __call__(self, ticker, start, end):
+        self.calls.append((ticker, start, end))
+        if ticker in self.fail:
+            raise DownloadError(f"{ticker}: 받은 데이터가 없습니다")
+        index = pd.bdate_range(start, end, inclusive="left")
+        close = np.arange(len(index), dtype=np.float64) + index.day
+        return pd.DataFrame({"Close": close, "Volume": 1}, index=index)
+
+
+@pytest.fixture
+def today(monkeypatch):
+    # 저장소가 보는 "오늘"을 고정한다 (기본은 요청 구간보다 충분히 뒤)
+    day = {"value": pd.Timestamp("2024-06-03")}
+    monkeypatch.setattr(price_store, "_today", lambda: day["value"])
+    return day
+
+
+@pytest.fixture
+def store(tmp_path, today):
+    return PriceStore(root=tmp_path, fetcher=FakeFetcher())
+
+
+def test_second_get_is_served_from_disk(store, tmp_path):
+    first = store.get("AAPL", "2024-01-01", "2024-02-01")
+    assert store.fetcher.calls == [("AAPL", "2024-01-01", "2024-02-01")]
+
+    # 같은 구간과 그 안쪽 구간은 네트워크 없이 읽는다 (새 PriceStore도 같은 디렉터리를 쓰면 같다)
+    again = PriceStore(root=tmp_path, fetcher=store.fetcher)
+    pd.testing.assert_frame_equal(again.get("AAPL", "2024-01-01", "2024-02-01"), first, check_freq=False)
+    inner = again.get("AAPL", "2024-01-10", "2024-01-20")
+    assert len(store.fetcher.calls) == 1
+    assert inner.index.min() >= pd.Timestamp("2024-01-10")
+    assert inner.index.max() < pd.Timestamp("2024-01-20")
+
+
+def test_only_missing_ranges_are_fetched(store):
+    store.get("AAPL", "2024-02-01", "2024-03-01")
+    data = store.get("AAPL", "2024-01-01", "2024-04-01")
+
+    assert store.fetcher.calls == [
+        ("AAPL", "2024-02-01", "2024-03-01"),
+        ("AAPL", "2024-01-01", "2024-02-01"),
+        ("AAPL", "2024-03-01", "2024-04-01"),
+    ]
+    expected = pd.bdate_range("2024-01-01", "2024-04-01", inclusive="left")
+    assert data.index.equals(expected)
+
+
+def test_failed_range_is_not_recorded_as_covered(tmp_path, today):
+    fetcher = FakeFetcher(fail={"2222.SR"})
+    store = PriceStore(root=tmp_path, fetcher=fetcher)
+    with pytest.raises(DownloadError):
+        store.get("2222.SR", "2024-01-01", "2024-02-01")
+
+    # 다음 요청에서 같은 구간을 다시 받는다
+    fetcher.fail.clear()
+    assert len(store.get("2222.SR", "2024-01-01", "2024-02-01"))
+    assert len(fetcher.calls) == 2
+
+
+def test_future_end_is_covered_for_the_rest_of_the_day(store, tmp_path, today):
+    today["value"] = pd.Timestamp("2024-01-31")
+    store.get("AAPL", "2024-01-01", "2024-02-01")
+    data_path = tmp_path / "AAPL.parquet"
+    written = data_path.stat().st_mtime_ns
+
+    # 같은 날에는 내일까지인 요청도 다시 받지 않고 파일도 다시 쓰지 않는다
+    store.get("AAPL", "2024-01-01", "2024-02-01")
+    assert len(store.fetcher.calls) == 1
+    assert data_path.stat().st_mtime_ns == written
+
+    # 다음 날에는 마지막으로 저장된 거래일(1/31)부터 다시 받아 장중 종가를 확정 종가로 바꾼다
+    today["value"] = pd.Timestamp("2024-02-01")
+    store.get("AAPL", "2024-01-01", "2024-02-02")
+    assert store.fetcher.calls[-1] == ("AAPL", "2024-01-31", "2024-02-02")
+    store.get("AAPL", "2024-01-01", "2024-02-02")
+    assert len(store.fetcher.calls) == 2
+
+
+def _engine(store, max_entries):
+    def load_frames(tickers, start, end):
+        result = FetchResult()
+        for ticker in tickers:
+            try:
+                result.data[ticker] = store.get(ticker, start, end)
+            except Exception as e:
+                result.errors[ticker] = e
+        return result
+
+    return PriceEngine(load_frames, max_entries=max_entries)
+
+
+def test_engine_keeps_recent_matrices_and_evicts_least_recently_used(store):
+    engine = _engine(store, max_entries=2)
+    jan = engine.matrix(["AAPL", "MSFT"], "2024-01-01", "2024-02-01")
+    feb = engine.matrix(["AAPL", "MSFT"], "2024-02-01", "2024-03-01")
+
+    # 최근에 쓴 행렬은 같은 객체를 돌려준다 (티커 순서는 키에 영향 없음)
+    assert engine.matrix(["MSFT", "AAPL"], "2024-01-01", "2024-02-01") is jan
+
+    # 세 번째 구간이 들어오면 가장 오래 안 쓴 2월 행렬이 밀려난다
+    engine.matrix(["AAPL", "MSFT"], "2024-03-01", "2024-04-01")
+    assert engine.matrix(["AAPL", "MSFT"], "2024-01-01", "2024-02-01") is jan
+    rebuilt = engine.matrix(["AAPL", "MSFT"], "2024-02-01", "2024-03-01")
+    assert rebuilt is not feb
+    np.testing.assert_array_equal(rebuilt.values, feb.values)
+    # 밀려난 행렬을 다시 만들 때도 가격은 디스크 저장소에서 읽는다
+    assert len(store.fetcher.calls) == 6
+
+
+def test_engine_does_not_cache_partial_failures(tmp_path, today):
+    fetcher = FakeFetcher(fail={"2222.SR"})
+    engine = _engine(PriceStore(root=tmp_path, fetcher=fetcher), max_entries=4)
+
+    matrix = engine.matrix(["AAPL", "2222.SR"], "2024-01-01", "2024-02-01")
+    assert matrix.tickers == ["AAPL"]
+    assert matrix.missing == ["2222.SR"]
+    assert isinstance(matrix.errors["2222.SR"], DownloadError)
+    assert engine.matrix(["AAPL", "2222.SR"], "2024-01-01", "2024-02-01") is not matrix
@@ -0,0 +1,97 @@
+"""일본 관광지 데이터 로더와 공간 인덱스.
+
+관광지 데이터는 data/attractions.json에 {도시: {위치, 설명, 명소: {이름: {위치, 설명, 이미지}}}}
+형태로 둔다. SpotIndex는 모든 명소를 위도/경도 격자 칸(버킷)에 나눠 담아 두고, 반경 검색과
+최근접 k개 검색을 할 때 주변 칸의 명소만 하버사인 거리로 계산한다 (전체를 훑지 않음).
+"""
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+DATA_PATH = Path(__file__).resolve().parent.parent / "data" / "attractions.json"
+EARTH_RADIUS_KM = 6371.0
+
+
+def data_version(path=DATA_PATH):
+    # 데이터 파일이 바뀌면 달라지는 값, 캐시 키로 쓴다
+    return Path(path).stat().st_mtime_ns
+
+
+def load_attractions(path=DATA_PATH):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def flatten_spots(attractions):
+    # 도시별로 중첩된 명소를 (도시, 이름, 위도, 경도) 한 줄씩의 표로 편다
+    records = [
+        {"도시": city, "이름": name, "위도": spot["위치"][0], "경도": spot["위치"][1]}
+        for city, info in attractions.items()
+        for name, spot in info["명소"].items()
+    ]
+    return pd.DataFrame(records, columns=["도시", "이름", "위도", "경도"])
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+class SpotIndex:
+    def __init__(self, spots, cell_deg=0.25):
+        # spots: flatten_spots()의 표
+        self.spots = spots.reset_index(drop=True)
+        self.lat = self.spots["위도"].to_numpy(dtype=np.float64)
+        self.lon = self.spots["경도"].to_numpy(dtype=np.float64)
+        self.cell_deg = cell_deg
+
+        # 격자 칸별로 명소 인덱스를 모아 둔다
+        rows = np.floor(self.lat / cell_deg).astype(np.int64)
+        cols = np.floor(self.lon / cell_deg).astype(np.int64)
+        self.buckets = {}
+        for key, members in pd.Series(np.arange(len(self.spots))).groupby([rows, cols]):
+            self.buckets[key] = members.to_numpy()
+
+    def _candidates(self, south, west, north, east):
+        # 사각형 범위를 덮는 격자 칸들의 명소만 후보로 고른다
+        row_range = range(int(np.floor(south / self.cell_deg)), int(np.floor(north / self.cell_deg)) + 1)
+        col_range = range(int(np.floor(west / self.cell_deg)), int(np.floor(east / self.cell_deg)) + 1)
+        if len(row_range) * len(col_range) > len(self.buckets):
+            return np.arange(len(self.spots))
+        found = [self.buckets[(r, c)] for r in row_range for c in col_range if (r, c) in self.buckets]
+        return np.concatenate(found) if found else np.array([], dtype=np.int64)
+
+    def in_bounds(self, south, west, north, east):
+        """지도 화면 범위 안에 있는 명소만 돌려준다."""
+        candidates = self._candidates(south, west, north, east)
+        lat, lon = self.lat[candidates], self.lon[candidates]
+        inside = (lat >= south) & (lat <= north) & (lon >= west) & (lon <= east)
+        return self.spots.iloc[np.sort(candidates[inside])]
+
+    def within(self, lat, lon, radius_km):
+        """반경 radius_km 안의 명소를 가까운 순으로 돌려준다 ('거리 (km)' 열 추가)."""
+        dlat = radius_km / 111.0
+        dlon = radius_km / (111.0 * max(np.cos(np.radians(lat)), 1e-6))
+        candidates = self._candidates(lat - dlat, lon - dlon, lat + dlat, lon + dlon)
+        distances = haversine_km(lat, lon, self.lat[candidates], self.lon[candidates])
+        inside = distances <= radius_km
+        candidates, distances = candidates[inside], distances[inside]
+        order = np.argsort(distances, kind="stable")
+        result = self.spots.iloc[candidates[order]].copy()
+        result["거리 (km)"] = distances[order]
+        return result
+
+    def nearest(self, lat, lon, k=5, exclude=None):
+        """가장 가까운 명소 k개를 돌려준다. exclude에 든 이름은 뺀다."""
+        exclude = set(exclude or ())
+        radius_km = self.cell_deg * 111.0
+        while True:
+            result = self.within(lat, lon, radius_km)
+            result = result[~result["이름"].isin(exclude)]
+            # 반경 안에서 k개를 찾았거나 이미 전체를 본 경우 (반경 검색은 정확하므로 그대로 상위 k개)
+            if len(result) >= k or radius_km > 2 * np.pi * EARTH_RADIUS_KM:
+                return result.head(k)
+            radius_km *= 2
@@ -0,0 +1,115 @@
+"""막대그래프용 사전 집계 엔진.
+
+sns.barplot은 원본 행 전체로 부트스트랩 신뢰구간을 구하고, 숫자형 X는 값마다 막대를
+하나씩 만든다. 여기서는 먼저 X를 그룹으로 나누고(숫자/날짜는 구간으로 나누고, 종류가
+많은 범주는 상위 N개 + '기타'로 묶음) np.bincount로 그룹별 개수/합/제곱합을 한 번에
+구한 뒤, 정규근사 신뢰구간과 함께 작은 집계표만 그래프 단계로 넘긴다.
+"""
+import numpy as np
+import pandas as pd
+
+STATS = {"평균": "mean", "합계": "sum", "개수": "count"}
+
+
+def _bin_codes(values, max_bins, value_range=None):
+    # 숫자형(또는 int64로 바꾼 날짜) 값을 같은 너비 구간으로 나눈다 (범위를 알면 다시 훑지 않음)
+    lo, hi = value_range if value_range is not None else (values.min(), values.max())
+    edges = np.linspace(lo, hi, max_bins + 1) if hi > lo else np.array([lo, lo + 1])
+    codes = np.clip(np.searchsorted(edges, values, side="right") - 1, 0, len(edges) - 2)
+    return codes, edges
+
+
+def _group_codes(x, top_n, max_bins, other_label, distinct=None, value_range=None):
+    is_datetime = pd.api.types.is_datetime64_any_dtype(x)
+    is_number = pd.api.types.is_numeric_dtype(x) and not pd.api.types.is_bool_dtype(x)
+    ordered = is_number or is_datetime
+
+    if distinct is None:
+        distinct = x.nunique()
+    # 숫자/날짜는 값마다 막대를 그리기엔 많으면(top_n 초과) 구간으로 나눈다. 서로 관계없는 값을
+    # '기타' 하나로 묶으면 축의 순서가 깨지므로 아래의 상위 N개 묶기는 범주형에만 쓴다
+    if ordered and distinct > top_n:
+        raw = x.to_numpy()
+        values = raw.astype(np.int64) if is_datetime else x.to_numpy(dtype=np.float64)
+        if value_range is not None:
+            # 날짜 범위는 값과 같은 단위의 정수로 맞춘다
+            value_range = pd.Series(value_range).astype(x.dtype).to_numpy().astype(values.dtype)
+        # 값 종류가 max_bins 이하이면 top_n칸만 써서 칸이 값 종류보다 많아지지 않게 한다
+        codes, edges = _bin_codes(values, max_bins if distinct > max_bins else top_n, value_range)
+        if is_datetime:
+            # 경계는 열과 같은 단위(pandas 3은 보통 us)의 datetime64로 되돌린다
+            edges = pd.DatetimeIndex(edges.astype(np.int64).astype(raw.dtype)).strftime("%Y-%m-%d")
+            labels = [f"{a}~{b}" for a, b in zip(edges[:-1], edges[1:])]
+        else:
+            labels = [f"{a:.3g}~{b:.3g}" for a, b in zip(edges[:-1], edges[1:])]
+        return codes, labels
+
+    # 범주형: 숫자는 값 순서, 그 밖에는 등장 순서(category는 범주 순서)로 막대를 놓는다
+    codes, uniques = pd.factorize(x, sort=ordered or isinstance(x.dtype, pd.CategoricalDtype))
+    labels = [str(u) for u in uniques]
+    if not ordered and len(labels) > top_n:
+        counts = np.bincount(codes, minlength=len(labels))
+        top = np.sort(np.argsort(-counts, kind="stable")[:top_n])
+        remap = np.full(len(labels), top_n)
+        remap[top] = np.arange(top_n)
+        codes = remap[codes]
+        labels = [labels[i] for i in top] + [other_label]
+    return codes, labels
+
+
+def aggregate_bars(x, y, stat="mean", ci=True, top_n=20, max_bins=30, other_label="기타",
+                   distinct=None, value_range=None):
+    """막대 하나에 한 행씩 (label, value, lower, upper, count) 집계표를 돌려준다.
+
+    distinct(X의 서로 다른 값 개수)와 value_range(X의 최솟값, 최댓값)를 열 통계에서 넘기면
+    구간을 나눌지 정하거나 구간 경계를 만들 때 X를 다시 훑지 않는다.
+    """
+    valid = x.notna().to_numpy() & y.notna().to_numpy()
+    x = x[valid]
+    y = y[valid].to_numpy(dtype=np.float64)
+    codes, labels = _group_codes(x, top_n, max_bins, other_label, distinct, value_range)
+
+    n_groups = len(labels)
+    count = np.bincount(codes, minlength=n_groups).astype(np.float64)
+    total = np.bincount(codes, weights=y, minlength=n_groups)
+    total_sq = np.bincount(codes, weights=y * y, minlength=n_groups)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = total / count
+        var = np.maximum(total_sq / count - mean ** 2, 0) * count / (count - 1)
+        std = np.sqrt(var)
+        if stat == "mean":
+            value, half = mean, 1.96 * std / np.sqrt(count)
+        elif stat == "sum":
+            value, half = total, 1.96 * std * np.sqrt(count)
+        elif stat == "count":
+            value, half = count, np.full(n_groups, np.nan)
+        else:
+            raise ValueError(f"지원하지 않는 집계 방식입니다: {stat}")
+
+    if not ci:
+        half = np.full(n_groups, np.nan)
+    table = pd.DataFrame({
+        "label": labels,
+        "value": value,
+        "lower": value - half,
+        "upper": value + half,
+        "count": count.astype(np.int64),
+    })
+    # 구간으로 나눈 경우 빈 구간은 그리지 않는다
+    return table[table["count"] > 0].reset_index(drop=True)
+
+
+def draw_bars(ax, table, palette="pastel"):
+    import seaborn as sns
+
+    positions = np.arange(len(table))
+    errors = None
+    if table["lower"].notna().any():
+        errors = np.vstack([table["value"] - table["lower"], table["upper"] - table["value"]])
+    ax.bar(positions, table["value"], yerr=errors, color=sns.color_palette(palette, len(table)),
+           ecolor="#444444", capsize=3 if len(table) <= 30 else 0)
+    ax.set_xticks(positions)
+    ax.set_xticklabels(table["label"])
+    if len(table) > 10 or table["label"].str.len().max() > 8:
+        ax.tick_params(axis="x", rotation=45)
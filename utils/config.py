@@ -0,0 +1,5 @@
+import os
+from pathlib import Path
+
+# 로컬 캐시 루트 디렉터리 (A1_CACHE_DIR 환경 변수로 바꿀 수 있음)
+CACHE_DIR = Path(os.environ.get("A1_CACHE_DIR", Path(__file__).resolve().parent.parent / ".cache"))
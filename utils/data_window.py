@@ -0,0 +1,78 @@
+"""큰 표의 일부(보이는 행 구간)만 잘라 보여주기 위한 정렬/필터 인덱스.
+
+정렬과 필터는 DataFrame을 다시 만들지 않고 행 위치(정수 배열)로만 계산한다. 페이지를 넘길
+때는 이미 계산된 위치 배열에서 offset부터 limit개만 골라 그 행들만 꺼내므로, 한 번 조작할 때
+브라우저로 가는 양과 새로 쓰는 메모리가 전체 행 수와 상관없이 페이지 크기만큼이다.
+"""
+import operator
+import re
+
+import numpy as np
+import pandas as pd
+
+# 숫자/날짜 열 필터 문법: "> 10", "<= 2025-03-01", "10..20", "=3" (연산자가 없으면 같음)
+_COMPARISON = re.compile(r"^\s*(<=|>=|<|>|=|==)?\s*(.+?)\s*$")
+_RANGE = re.compile(r"^\s*(.+?)\s*(?:\.\.|~)\s*(.+?)\s*$")
+
+
+def _position_dtype(length):
+    # 행 위치 배열은 캐시에 오래 남으므로 20억 행 미만이면 int32로 절반만 쓴다
+    return np.int32 if length < 2 ** 31 else np.int64
+
+
+def sort_order(series, ascending=True):
+    """series를 정렬했을 때의 행 위치 배열. 빈 값은 항상 맨 뒤로 보낸다."""
+    s = series.reset_index(drop=True)
+    if isinstance(s.dtype, pd.CategoricalDtype) and not s.cat.ordered:
+        # 순서 없는 범주는 등장 순서가 아니라 값(글자) 순서로 정렬한다
+        s = s.cat.set_categories(s.cat.categories.sort_values(), ordered=True)
+    elif s.dtype == object:
+        s = s.astype("string")
+    order = s.sort_values(ascending=ascending, na_position="last", kind="stable").index
+    return order.to_numpy(dtype=_position_dtype(len(s)))
+
+
+def _parse_value(text, series):
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return pd.Timestamp(text)
+    return float(text)
+
+
+def filter_mask(series, query):
+    """series에서 query에 맞는 행의 bool 배열. 숫자/날짜는 비교식, 그 밖에는 글자 포함(대소문자 무시)."""
+    query = query.strip()
+    if pd.api.types.is_bool_dtype(series) or not (
+        pd.api.types.is_numeric_dtype(series) or pd.api.types.is_datetime64_any_dtype(series)
+    ):
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            # 범주는 종류별로 한 번만 비교하고 코드로 펼친다
+            matched = series.cat.categories.astype(str).str.contains(query, case=False, regex=False)
+            codes = series.cat.codes.to_numpy()
+            return np.append(np.asarray(matched, dtype=bool), False)[codes]
+        return series.astype("string").str.contains(query, case=False, regex=False).fillna(False).to_numpy(bool)
+
+    range_match = _RANGE.match(query)
+    try:
+        if range_match:
+            low, high = (_parse_value(v, series) for v in range_match.groups())
+            mask = (series >= low) & (series <= high)
+        else:
+            op, text = _COMPARISON.match(query).groups()
+            compare = {"<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge}.get(op, operator.eq)
+            mask = compare(series, _parse_value(text, series))
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"'{query}'를 이해하지 못했습니다. 예: > 10, 10..20, = 3") from e
+    return mask.fillna(False).to_numpy(dtype=bool)
+
+
+def visible_positions(length, order=None, mask=None):
+    """정렬 순서(order)를 따르면서 필터(mask)를 통과한 행 위치 배열."""
+    positions = order if order is not None else np.arange(length, dtype=_position_dtype(length))
+    if mask is not None:
+        positions = positions[mask[positions]]
+    return positions
+
+
+def window(df, positions, offset, limit):
+    """positions[offset:offset + limit]에 해당하는 행만 꺼낸다 (원래 행 번호를 인덱스로 유지)."""
+    return df.iloc[positions[offset:offset + limit]]
@@ -0,0 +1,70 @@
+"""업로드된 엑셀을 파싱한 결과를 내용 해시로 저장해 두는 디스크 캐시.
+
+키는 업로드 파일 바이트의 SHA-256과 시트 이름(및 읽기 옵션)으로 만든다. 같은 파일이면
+어느 페이지, 어느 세션에서 올렸든 같은 항목을 쓰므로, 위젯을 바꿀 때마다 엑셀을 다시
+파싱하지 않고 Parquet 파일만 읽는다. 전체 용량은 max_bytes를 넘지 않도록 LRU로 지운다.
+"""
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+
+import pandas as pd
+
+from utils.config import CACHE_DIR
+from utils.disk_cache import evict_lru, touch
+
+
+def dataset_key(data, sheet_name=None, **options):
+    digest = hashlib.sha256(data)
+    digest.update(json.dumps([sheet_name, sorted(options.items())], default=str).encode())
+    return digest.hexdigest()
+
+
+class DatasetCache:
+    def __init__(self, root=None, max_bytes=512 * 1024 ** 2):
+        self.root = Path(root) if root else CACHE_DIR / "datasets"
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def contains(self, key):
+        return any((self.root / f"{key}{suffix}").exists() for suffix in (".parquet", ".pkl"))
+
+    def get(self, key):
+        # (DataFrame, meta dict)를 돌려주고, 없으면 None
+        meta_path = self.root / f"{key}.json"
+        for suffix, reader in ((".parquet", pd.read_parquet), (".pkl", pd.read_pickle)):
+            path = self.root / f"{key}{suffix}"
+            if path.exists():
+                try:
+                    df = reader(path)
+                    meta = json.loads(meta_path.read_text()) if meta_path.exists() else {}
+                except (OSError, ValueError):
+                    return None
+                touch(path)
+                touch(meta_path)
+                return df, meta
+        return None
+
+    def put_meta(self, key, meta):
+        # 이미 저장된 항목의 부가 정보만 바꾼다 (예전 항목에 새 통계를 덧붙일 때)
+        (self.root / f"{key}.json").write_text(json.dumps(meta, ensure_ascii=False, default=str))
+
+    def put(self, key, df, meta=None):
+        path = self.root / f"{key}.parquet"
+        tmp_path = self.root / f"{key}.parquet.tmp"
+        try:
+            df.to_parquet(tmp_path)
+        except (ValueError, TypeError):
+            # 한 열에 숫자와 글자가 섞여 있으면 Parquet으로 못 쓰므로 pickle로 저장
+            tmp_path.unlink(missing_ok=True)
+            path = self.root / f"{key}.pkl"
+            tmp_path = self.root / f"{key}.pkl.tmp"
+            df.to_pickle(tmp_path)
+        os.replace(tmp_path, path)
+        (self.root / f"{key}.json").write_text(json.dumps(meta or {}, ensure_ascii=False, default=str))
+
+        with self._lock:
+            evict_lru(self.root, self.max_bytes)
@@ -0,0 +1,93 @@
+"""점이 아주 많은 산점도/선그래프를 2차원 밀도 이미지로 그리는 도구.
+
+matplotlib은 점(마커) 하나마다 그리기 작업을 하므로 수십만 개가 넘으면 그리는 시간과
+PNG 크기가 크게 늘어난다. 여기서는 화면을 가로×세로 칸으로 나눠 칸마다 점 개수를
+np.bincount로 세고, 그 개수 배열 하나를 imshow로 칠한 뒤 축을 겹친다. 점 개수가
+threshold를 넘을 때만 이 방식으로 바꾼다.
+"""
+import numpy as np
+import pandas as pd
+
+# 이보다 점이 많으면 밀도 이미지로 그린다
+DENSITY_THRESHOLD = 50_000
+
+
+def _as_float(values):
+    # 날짜는 matplotlib 날짜 숫자(일 단위)로 바꿔 같은 축 눈금을 쓰게 한다
+    if pd.api.types.is_datetime64_any_dtype(values):
+        import matplotlib.dates as mdates
+
+        return mdates.date2num(pd.Series(values).dt.tz_localize(None).to_numpy()), True
+    return np.asarray(values, dtype=np.float64), False
+
+
+def density_grid(x, y, bins=(400, 300), extent=None):
+    """칸별 점 개수 (세로 칸, 가로 칸) 배열과 (x0, x1, y0, y1) 범위를 돌려준다."""
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    finite = np.isfinite(x) & np.isfinite(y)
+    if not finite.all():
+        x, y = x[finite], y[finite]
+    nx, ny = bins
+    if extent is None:
+        if len(x):
+            extent = (x.min(), x.max(), y.min(), y.max())
+        else:
+            extent = (0.0, 1.0, 0.0, 1.0)
+    x0, x1, y0, y1 = extent
+    if x1 <= x0:
+        x0, x1 = x0 - 0.5, x0 + 0.5
+    if y1 <= y0:
+        y0, y1 = y0 - 0.5, y0 + 0.5
+
+    # histogram2d보다 빠르게: 칸 번호를 직접 계산해 1차원 bincount 한 번으로 센다
+    xi = np.clip(((x - x0) * (nx / (x1 - x0))).astype(np.int64), 0, nx - 1)
+    yi = np.clip(((y - y0) * (ny / (y1 - y0))).astype(np.int64), 0, ny - 1)
+    counts = np.bincount(yi * nx + xi, minlength=nx * ny).reshape(ny, nx)
+    return counts, (x0, x1, y0, y1)
+
+
+def draw_density(ax, x, y, bins=(400, 300), cmap="viridis", colorbar=True, limits=None):
+    """x, y 점들을 밀도 이미지로 ax에 그린다. 점 개수는 로그 색으로 칠하고 빈 칸은 비워 둔다.
+
+    limits=((x 최솟값, x 최댓값), (y 최솟값, y 최댓값))을 주면 그 범위로 칸을 나눈다 (열 통계 등).
+    """
+    from matplotlib.colors import LogNorm
+
+    x_values, is_date = _as_float(x)
+    extent = None
+    if limits is not None and None not in limits:
+        (x0, x1), (y0, y1) = limits
+        x0, x1 = _as_float(pd.Series([x0, x1]))[0]
+        extent = (x0, x1, float(y0), float(y1))
+    counts, extent = density_grid(x_values, y, bins=bins, extent=extent)
+    image = ax.imshow(
+        np.ma.masked_equal(counts, 0), extent=extent, origin="lower", aspect="auto",
+        cmap=cmap, norm=LogNorm(vmin=1, vmax=max(counts.max(), 1)), interpolation="nearest",
+    )
+    if is_date:
+        ax.xaxis_date()
+    if colorbar:
+        ax.figure.colorbar(image, ax=ax, label="점 개수")
+    return image
+
+
+def can_draw_density(x, y):
+    # 숫자형/날짜형 X와 숫자형 Y만 평면 위 점으로 볼 수 있다
+    x_ok = pd.api.types.is_datetime64_any_dtype(x) or (
+        pd.api.types.is_numeric_dtype(x) and not pd.api.types.is_bool_dtype(x)
+    )
+    return x_ok and pd.api.types.is_numeric_dtype(y)
+
+
+def use_density(x, y, threshold=DENSITY_THRESHOLD):
+    return len(x) > threshold and can_draw_density(x, y)
+
+
+def scatter_or_density(ax, x, y, threshold=DENSITY_THRESHOLD, cmap="viridis", **scatter_kwargs):
+    """점이 threshold개 이하면 보통 산점도, 넘으면 밀도 이미지를 그린다. 쓴 방식을 돌려준다."""
+    if use_density(x, y, threshold):
+        draw_density(ax, x, y, cmap=cmap)
+        return "density"
+    ax.scatter(x, y, **scatter_kwargs)
+    return "scatter"
@@ -0,0 +1,36 @@
+"""디스크 캐시 디렉터리의 용량을 제한하는 LRU 도우미.
+
+캐시 파일을 읽을 때마다 touch()로 수정 시각을 갱신해 두고, 용량을 넘으면
+가장 오래 쓰이지 않은 파일부터 지운다. 같은 이름(확장자만 다른) 파일은 한 항목으로 본다.
+"""
+import os
+import time
+
+
+def touch(path):
+    try:
+        os.utime(path, (time.time(), time.time()))
+    except FileNotFoundError:
+        pass
+
+
+def evict_lru(directory, max_bytes):
+    entries = {}
+    for entry in os.scandir(directory):
+        if not entry.is_file() or entry.name.endswith(".tmp"):
+            continue
+        stat = entry.stat()
+        stem = entry.name.split(".", 1)[0]
+        size, mtime, paths = entries.get(stem, (0, 0.0, []))
+        entries[stem] = (size + stat.st_size, max(mtime, stat.st_mtime), paths + [entry.path])
+
+    total = sum(size for size, _, _ in entries.values())
+    for size, _, paths in sorted(entries.values(), key=lambda item: item[1]):
+        if total <= max_bytes:
+            break
+        for path in paths:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        total -= size
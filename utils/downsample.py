@@ -0,0 +1,89 @@
+"""긴 시계열을 화면 픽셀 수 정도로 줄이는 다운샘플링.
+
+Largest-Triangle-Three-Buckets(LTTB): 데이터를 n_out개 구간으로 나누고, 각 구간에서
+직전 선택점과 다음 구간 평균점으로 만든 삼각형 넓이가 가장 큰 점을 고른다.
+급등락 같은 눈에 보이는 모양은 유지하면서 점 개수만 줄어든다.
+"""
+import numpy as np
+
+
+# 구간 하나의 점 수가 이보다 적으면 (이전 선택점 후보 × 구간 점) 넓이 표를 한 번에 계산한다
+TABLE_MAX_BUCKET = 24
+TABLE_CHUNK = 2_000_000     # 넓이 표를 나눠 계산할 때 한 번에 만드는 원소 수
+
+
+def _buckets(x, y, n_out):
+    # 구간 경계: 첫 점과 마지막 점은 항상 남기고 가운데를 n_out - 2개 구간으로 나눈다
+    n = len(x)
+    edges = (np.arange(n_out - 1) * (n - 2) / (n_out - 2)).astype(np.int64) + 1
+    edges[-1] = n - 1
+    # 구간 i의 "다음 구간" 평균점 (마지막 구간의 다음은 마지막 점 하나)
+    counts = np.diff(np.append(edges[1:], n))
+    avg_x = np.add.reduceat(x, edges[1:]) / counts
+    avg_y = np.add.reduceat(y, edges[1:]) / counts
+    return edges, avg_x, avg_y
+
+
+def _area(xa, ya, x, y, avg_x, avg_y):
+    return np.abs((xa - avg_x) * (y - ya) - (xa - x) * (avg_y - ya))
+
+
+def _select_by_table(x, y, edges, avg_x, avg_y):
+    # 구간 i에서 고르는 점은 직전 구간에서 고른 점(a)에만 달려 있으므로, 직전 구간의 점마다
+    # 고를 점을 표로 먼저 계산해 두고(NumPy) 앞에서부터 표를 따라가기만 한다
+    starts, stops = edges[:-1], edges[1:]
+    width = int((stops - starts).max())
+    points = np.minimum(starts[:, None] + np.arange(width), stops[:, None] - 1)    # (구간, 점), 모자란 칸은 끝 점 반복
+    previous = np.vstack([np.zeros((1, width), dtype=np.int64), points[:-1]])       # 첫 구간의 a는 0번 점
+    choice = np.empty(points.shape, dtype=np.int64)
+    step = max(1, TABLE_CHUNK // (width * width))
+    for s in range(0, len(points), step):
+        rows = slice(s, s + step)
+        a, p = previous[rows][:, :, None], points[rows][:, None, :]
+        area = _area(x[a], y[a], x[p], y[p], avg_x[rows, None, None], avg_y[rows, None, None])
+        choice[rows] = area.argmax(axis=2)
+
+    picked = np.empty(len(points), dtype=np.int64)
+    column = 0
+    for i, row in enumerate(choice.tolist()):
+        column = row[column]
+        picked[i] = column
+    return starts + picked
+
+
+def _select_by_loop(x, y, edges, avg_x, avg_y):
+    # 구간이 커서 표가 너무 클 때: 구간마다 직전 선택점으로 넓이를 계산한다
+    picked = np.empty(len(edges) - 1, dtype=np.int64)
+    a = 0
+    for i in range(len(edges) - 1):
+        start, end = edges[i], edges[i + 1]
+        area = _area(x[a], y[a], x[start:end], y[start:end], avg_x[i], avg_y[i])
+        a = start + int(np.argmax(area))
+        picked[i] = a
+    return picked
+
+
+def lttb_indices(x, y, n_out):
+    # 남길 점의 인덱스를 돌려준다 (x는 오름차순 숫자, 날짜는 int64로 바꿔서 넘긴다)
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    edges, avg_x, avg_y = _buckets(x, y, n_out)
+    select = _select_by_table if np.diff(edges).max() <= TABLE_MAX_BUCKET else _select_by_loop
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    selected[1:-1] = select(x, y, edges, avg_x, avg_y)
+    return selected
+
+
+def downsample_series(dates, values, n_out):
+    # 결측값을 뺀 뒤 LTTB로 줄인 (날짜, 값)을 돌려준다
+    valid = ~np.isnan(values)
+    dates, values = dates[valid], values[valid]
+    keep = lttb_indices(dates.to_numpy().astype(np.int64), values, n_out)
+    return dates[keep], values[keep]
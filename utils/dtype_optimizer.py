@@ -0,0 +1,71 @@
+"""업로드된 DataFrame의 메모리를 줄이는 dtype 변환 단계.
+
+- 정수는 값 범위에 맞는 가장 작은 정수형으로, 실수는 값이 바뀌지 않을 때만 float32로 줄인다
+- 날짜처럼 보이는 문자열 열은 datetime64로 바꾼다
+- 종류가 적은 문자열 열(반 이름 등)은 category로 바꾼다
+"""
+import warnings
+
+import numpy as np
+import pandas as pd
+
+
+def _is_text(s):
+    return s.dtype == object or pd.api.types.is_string_dtype(s)
+
+
+def _parse_dates(s, sample_size=100):
+    # 앞쪽 일부가 모두 날짜로 읽히고, 숫자 문자열이 아닐 때만 전체를 변환한다
+    values = s.dropna()
+    if values.empty or not all(isinstance(v, str) for v in values.iloc[:sample_size]):
+        return None
+    sample = values.iloc[:sample_size]
+    if pd.to_numeric(sample, errors="coerce").notna().any():
+        return None
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        if pd.to_datetime(sample, errors="coerce").isna().any():
+            return None
+        parsed = pd.to_datetime(s, errors="coerce")
+    # 일부 값이 날짜로 안 읽히면 원래 값을 잃으므로 바꾸지 않는다
+    if parsed.isna().sum() != s.isna().sum():
+        return None
+    return parsed
+
+
+def _optimize_column(s, max_category_ratio, max_categories):
+    if pd.api.types.is_bool_dtype(s):
+        return s
+    if pd.api.types.is_integer_dtype(s):
+        return pd.to_numeric(s, downcast="integer")
+    if pd.api.types.is_float_dtype(s):
+        downcast = s.astype(np.float32)
+        if np.array_equal(downcast.to_numpy(dtype=np.float64), s.to_numpy(), equal_nan=True):
+            return downcast
+        return s
+    if _is_text(s):
+        parsed = _parse_dates(s)
+        if parsed is not None:
+            return parsed
+        distinct = s.nunique(dropna=True)
+        if distinct <= max_categories and distinct <= max_category_ratio * len(s):
+            return s.astype("category")
+    return s
+
+
+def optimize_dtypes(df, max_category_ratio=0.5, max_categories=10_000):
+    """dtype을 줄인 DataFrame과 열별 변환 전/후 메모리 보고서를 돌려준다."""
+    columns = {}
+    report = []
+    for name in df.columns:
+        s = df[name]
+        optimized = _optimize_column(s, max_category_ratio, max_categories)
+        columns[name] = optimized
+        report.append({
+            "컬럼": name,
+            "변환 전": str(s.dtype),
+            "변환 후": str(optimized.dtype),
+            "변환 전 메모리 (KB)": round(s.memory_usage(deep=True, index=False) / 1024, 1),
+            "변환 후 메모리 (KB)": round(optimized.memory_usage(deep=True, index=False) / 1024, 1),
+        })
+    return pd.DataFrame(columns, index=df.index), pd.DataFrame(report)
@@ -0,0 +1,132 @@
+"""엑셀 시트를 조각(chunk) 단위로 읽는 스트리밍 파서.
+
+pd.read_excel은 통합 문서 전체를 openpyxl DOM으로 올린 뒤에야 DataFrame을 돌려주지만,
+여기서는 openpyxl 읽기 전용 모드로 행을 차례로 읽으면서 chunk_rows행마다 열별로
+타입이 정해진 Series를 만들어 쌓는다. 조각이 만들어질 때마다 on_chunk를 불러서
+화면에 미리보기와 진행률을 바로 보여줄 수 있다.
+
+빈 행과 빈 열은 pd.read_excel과 같게 다룬다: 중간의 빈 행은 빈 값 행으로 남기고 시트 끝의
+빈 행만 버리며, 값이 하나도 없는 열은 float64(NaN)가 된다.
+"""
+import numpy as np
+import pandas as pd
+
+
+def _column_names(header):
+    # pd.read_excel과 같은 규칙: 빈 제목은 'Unnamed: i', 중복 제목은 '.1', '.2'를 붙인다
+    names = []
+    seen = {}
+    for i, value in enumerate(header):
+        name = f"Unnamed: {i}" if value is None else str(value)
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
+
+
+def _data_rows(rows, width):
+    # 빈 행은 뒤에 값이 있는 행이 나올 때만 내보낸다 (중간 빈 행은 남기고 시트 끝의 빈 행은 버림)
+    blank = 0
+    for row in rows:
+        if all(value is None for value in row):
+            blank += 1
+            continue
+        for _ in range(blank):
+            yield (None,) * width
+        blank = 0
+        if len(row) < width:
+            row = row + (None,) * (width - len(row))
+        yield row
+
+
+class ColumnBuilder:
+    # 조각마다 열별 Series를 만들어 두었다가 마지막에 한 번만 이어 붙인다
+    def __init__(self, names):
+        self.names = names
+        self.parts = [[] for _ in names]
+        self.rows = 0
+
+    def add(self, rows):
+        width = len(self.names)
+        for j, values in enumerate(zip(*rows)):
+            if j >= width:
+                continue
+            # 조각 전체가 빈 값이면 행 수만 기억해 두고, 합칠 때 그 열의 dtype으로 채운다
+            # (None만 든 object 조각이 섞이면 숫자/날짜 열이 object가 된다)
+            if all(value is None for value in values):
+                self.parts[j].append(len(values))
+            else:
+                self.parts[j].append(pd.Series(values))
+        self.rows += len(rows)
+
+    def build(self):
+        columns = {}
+        for name, parts in zip(self.names, self.parts):
+            if not parts:
+                columns[name] = pd.Series(dtype=object)
+                continue
+            like = next((part for part in parts if isinstance(part, pd.Series)), None)
+            parts = [
+                part if isinstance(part, pd.Series)
+                else like.iloc[:0].reindex(range(part)) if like is not None
+                else pd.Series(np.full(part, np.nan))
+                for part in parts
+            ]
+            columns[name] = pd.concat(parts, ignore_index=True)
+        return pd.DataFrame(columns)
+
+
+def read_excel_streaming(file, sheet_name=None, chunk_rows=5000, max_rows=None, on_chunk=None):
+    """엑셀 시트를 조각 단위로 읽어 DataFrame을 돌려준다.
+
+    on_chunk(첫 조각 DataFrame, 지금까지 읽은 행 수, 전체 행 수 추정치 또는 None)는
+    조각이 만들어질 때마다 불린다. max_rows를 넘는 행은 읽지 않는다.
+    """
+    name = getattr(file, "name", "")
+    if name.lower().endswith(".xls"):
+        # 옛 .xls 형식은 openpyxl이 읽지 못하므로 pandas 기본 경로를 쓴다
+        df = pd.read_excel(file, sheet_name=sheet_name or 0, nrows=max_rows)
+        if on_chunk:
+            on_chunk(df.head(chunk_rows), len(df), len(df))
+        return df
+
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(file, read_only=True, data_only=True)
+    try:
+        sheet = workbook[sheet_name] if sheet_name else workbook.worksheets[0]
+        rows = sheet.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return pd.DataFrame()
+        builder = ColumnBuilder(_column_names(header))
+        width = len(builder.names)
+        total = sheet.max_row - 1 if sheet.max_row else None
+        if total is not None and max_rows:
+            total = min(total, max_rows)
+
+        first_chunk = None
+        chunk = []
+        for row in _data_rows(rows, width):
+            chunk.append(row)
+            if len(chunk) == chunk_rows or (max_rows and builder.rows + len(chunk) >= max_rows):
+                builder.add(chunk)
+                chunk = []
+                if first_chunk is None:
+                    first_chunk = builder.build()
+                if on_chunk:
+                    on_chunk(first_chunk, builder.rows, total)
+                if max_rows and builder.rows >= max_rows:
+                    break
+        if chunk:
+            builder.add(chunk)
+            if first_chunk is None:
+                first_chunk = builder.build()
+            if on_chunk:
+                on_chunk(first_chunk, builder.rows, total)
+        return builder.build()
+    finally:
+        workbook.close()
@@ -0,0 +1,108 @@
+"""여러 티커를 동시에 받아오는 스케줄러.
+
+정해진 개수의 스레드 풀로 받아오되, 호스트별 초당 요청 수를 제한하고
+실패하면 지수 백오프로 재시도한다. 티커별 제한 시간을 넘기거나 끝내 실패한
+티커는 errors에 모아 두고, 성공한 티커만으로 결과를 돌려준다.
+"""
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+
+
+def yahoo_host(ticker):
+    # yfinance는 티커와 상관없이 모두 같은 야후 파이낸스 서버로 요청한다
+    return "query1.finance.yahoo.com"
+
+
+class RateLimiter:
+    # 토큰 버킷: 초당 rate개의 요청을 허용하고, 순간적으로는 burst개까지 허용
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+
+
+@dataclass
+class FetchResult:
+    data: dict = field(default_factory=dict)
+    errors: dict = field(default_factory=dict)
+
+
+class FetchScheduler:
+    def __init__(self, fetch=None, max_workers=8, rate_per_host=5.0, burst=5,
+                 retries=2, backoff=0.5, timeout=20.0, host_of=yahoo_host):
+        self.fetch = fetch
+        self.max_workers = max_workers
+        self.rate_per_host = rate_per_host
+        self.burst = burst
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.host_of = host_of
+        self._limiters = {}
+        self._limiters_guard = threading.Lock()
+
+    def _limiter(self, host):
+        with self._limiters_guard:
+            if host not in self._limiters:
+                self._limiters[host] = RateLimiter(self.rate_per_host, self.burst)
+            return self._limiters[host]
+
+    def _run(self, fetch, ticker, started):
+        limiter = self._limiter(self.host_of(ticker))
+        for attempt in range(self.retries + 1):
+            limiter.acquire()
+            # 제한 시간은 요청 허가를 받은 뒤부터 잰다 (요청 제한 대기와 백오프는 세지 않음)
+            started[ticker] = time.monotonic()
+            try:
+                return fetch(ticker)
+            except Exception:
+                started.pop(ticker, None)
+                if attempt == self.retries:
+                    raise
+                time.sleep(self.backoff * 2 ** attempt)
+
+    def fetch_all(self, tickers, fetch=None):
+        # tickers: 받아올 티커 목록. 요청을 보낸 뒤 timeout초가 지난 티커는 기다리지 않는다
+        # fetch: 이번 호출에만 쓸 받아오기 함수 (없으면 self.fetch). 스케줄러 하나를 여러 기간/세션이
+        # 함께 써야 호스트별 요청 제한이 공유된다
+        fetch = fetch or self.fetch
+        result = FetchResult()
+        started = {}
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            pending = {executor.submit(self._run, fetch, ticker, started): ticker for ticker in tickers}
+            while pending:
+                done, _ = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+                for future in done:
+                    ticker = pending.pop(future)
+                    try:
+                        result.data[ticker] = future.result()
+                    except Exception as e:
+                        result.errors[ticker] = e
+
+                now = time.monotonic()
+                for future, ticker in list(pending.items()):
+                    since = started.get(ticker)
+                    if since is not None and now - since > self.timeout:
+                        del pending[future]
+                        result.errors[ticker] = TimeoutError(f"{ticker}: {self.timeout:g}초 안에 응답이 없습니다")
+        finally:
+            # 제한 시간을 넘긴 작업은 끝나기를 기다리지 않고 버린다
+            executor.shutdown(wait=False, cancel_futures=True)
+        return result
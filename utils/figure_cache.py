@@ -0,0 +1,72 @@
+"""슬라이더로 그리는 그래프의 PNG를 기억해 두는 LRU 캐시.
+
+(그래프 종류, 매개변수, figsize, 테마)가 같으면 matplotlib으로 다시 그리지 않고 저장해 둔
+PNG 바이트를 그대로 보여준다. 항목 수와 전체 바이트 수 두 가지로 크기를 제한하고,
+캐시 크기를 정할 수 있도록 적중/실패 횟수를 센다.
+"""
+import io
+import threading
+from collections import OrderedDict
+
+# st.pyplot과 같은 저장 옵션 (캐시 사용 여부와 관계없이 같은 그림이 나오도록)
+SAVEFIG_OPTIONS = {"bbox_inches": "tight", "dpi": 200, "format": "png"}
+
+
+def theme_key():
+    # 그림 모양에 영향을 주는 전역 설정 (폰트, 스타일 등)
+    import matplotlib.pyplot as plt
+
+    return tuple(
+        (name, str(plt.rcParams[name]))
+        for name in ("font.family", "axes.unicode_minus", "axes.facecolor", "axes.grid", "lines.linewidth")
+    )
+
+
+class FigureCache:
+    def __init__(self, max_entries=512, max_bytes=128 * 1024 ** 2):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get_or_render(self, kind, params, figsize, render):
+        """render(figsize) -> matplotlib Figure. 같은 키로 그린 적이 있으면 PNG를 재사용한다."""
+        import matplotlib.pyplot as plt
+
+        key = (kind, tuple(params), tuple(figsize), theme_key())
+        with self._lock:
+            png = self._entries.get(key)
+            if png is not None:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return png
+            self.misses += 1
+
+        fig = render(figsize)
+        buffer = io.BytesIO()
+        fig.savefig(buffer, **SAVEFIG_OPTIONS)
+        plt.close(fig)
+        png = buffer.getvalue()
+
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = png
+                self._bytes += len(png)
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                _, old = self._entries.popitem(last=False)
+                self._bytes -= len(old)
+        return png
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "적중": self.hits,
+                "실패": self.misses,
+                "적중률": self.hits / total if total else 0.0,
+                "항목 수": len(self._entries),
+                "용량 (MB)": self._bytes / 1024 ** 2,
+            }
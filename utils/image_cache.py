@@ -0,0 +1,122 @@
+"""원격 관광지 사진을 한 번만 받아 WebP 썸네일로 보관하는 로컬 이미지 캐시.
+
+브라우저가 매번 외부(Wikimedia) 원본 이미지를 받지 않도록, 서버에서 한 번 받아 작게 줄인
+WebP 파일을 디스크에 저장해 두고 그 파일을 st.image로 보여준다. 한 도시의 사진들은
+백그라운드 스레드 풀에서 미리 받아 두고, 받지 못한 사진은 잠시 동안 다시 시도하지 않는다.
+"""
+import hashlib
+import io
+import os
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from utils.config import CACHE_DIR
+from utils.disk_cache import evict_lru, touch
+
+# Wikimedia는 User-Agent가 없는 요청을 거절한다
+USER_AGENT = "A1-project-japan-guide/1.0 (streamlit thumbnail cache)"
+
+
+def urllib_opener(url, timeout):
+    request = urllib.request.Request(url, headers={"User-Agent": USER_AGENT})
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return response.read()
+
+
+class ThumbnailCache:
+    def __init__(self, root=None, max_bytes=100 * 1024 ** 2, size=(640, 480), timeout=5.0,
+                 max_workers=4, retry_after=600.0, opener=urllib_opener):
+        self.root = Path(root) if root else CACHE_DIR / "thumbnails"
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.size = size
+        self.timeout = timeout
+        self.retry_after = retry_after
+        # opener(url, timeout) -> bytes, 테스트에서는 로컬 HTTP 대체 서버용 함수를 넣는다
+        self.opener = opener
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="thumbnail")
+        self._pending = {}
+        self._failed = {}
+        self._lock = threading.Lock()
+
+    def path_for(self, url):
+        return self.root / f"{hashlib.sha1(url.encode()).hexdigest()}.webp"
+
+    def _download(self, url):
+        from PIL import Image
+
+        path = self.path_for(url)
+        try:
+            data = self.opener(url, self.timeout)
+            with Image.open(io.BytesIO(data)) as image:
+                image = image.convert("RGB")
+                image.thumbnail(self.size)
+                tmp_path = path.with_suffix(".webp.tmp")
+                image.save(tmp_path, "WEBP", quality=80)
+            os.replace(tmp_path, path)
+        except Exception:
+            with self._lock:
+                self._failed[url] = time.monotonic()
+            return None
+        finally:
+            with self._lock:
+                self._pending.pop(url, None)
+        evict_lru(self.root, self.max_bytes)
+        return path
+
+    def _recently_failed(self, url):
+        failed_at = self._failed.get(url)
+        return failed_at is not None and time.monotonic() - failed_at < self.retry_after
+
+    def _submit(self, url):
+        # 이미 받는 중이면 같은 작업을 돌려주고, 없으면 새로 시작한다 (락 안에서 호출)
+        future = self._pending.get(url)
+        if future is None:
+            future = self._executor.submit(self._download, url)
+            self._pending[url] = future
+        return future
+
+    def prefetch(self, urls):
+        # 아직 저장되지 않은 사진들을 백그라운드에서 받기 시작한다
+        with self._lock:
+            for url in urls:
+                if not self.path_for(url).exists() and not self._recently_failed(url):
+                    self._submit(url)
+
+    def get(self, url):
+        """저장된 썸네일 파일 경로. 아직 받는 중이거나 받을 수 없으면 None.
+
+        스크립트를 기다리게 하지 않는다: 없으면 받기를 시작(또는 이어서)만 하고 바로 돌아오며,
+        다 받은 사진은 다음 재실행에서 보인다. 받는 중인지 실패했는지는 loading()으로 구분한다.
+        """
+        path = self.path_for(url)
+        if path.exists():
+            touch(path)
+            return path
+        with self._lock:
+            if not self._recently_failed(url):
+                self._submit(url)
+        return None
+
+    def loading(self, url):
+        with self._lock:
+            return url in self._pending
+
+
+def placeholder_image(size=(640, 480)):
+    # 사진을 받지 못했을 때 대신 보여줄 회색 그림 (PNG 바이트)
+    from PIL import Image, ImageDraw
+
+    image = Image.new("RGB", size, "#e9ecef")
+    draw = ImageDraw.Draw(image)
+    w, h = size
+    # 가운데에 산 모양 아이콘
+    draw.polygon([(w * 0.3, h * 0.65), (w * 0.45, h * 0.4), (w * 0.6, h * 0.65)], fill="#adb5bd")
+    draw.polygon([(w * 0.5, h * 0.65), (w * 0.6, h * 0.5), (w * 0.7, h * 0.65)], fill="#ced4da")
+    draw.ellipse([w * 0.62, h * 0.3, w * 0.68, h * 0.38], fill="#ced4da")
+    buffer = io.BytesIO()
+    image.save(buffer, "PNG")
+    return buffer.getvalue()
@@ -0,0 +1,111 @@
+"""많은 점을 한 번에 올리는 folium 레이어.
+
+점마다 folium.CircleMarker를 만들면 점 하나당 파이썬 객체 하나와 JS 코드 블록 하나가
+생긴다. 여기서는 [위도, 경도, 값] 배열 하나만 JSON으로 보내고, 브라우저에서 반복문으로
+원을 만든다. 원 크기와 색은 값(지진 규모 등)에 따라 정해진다.
+"""
+import json
+
+import numpy as np
+from branca.element import MacroElement
+from folium.plugins import FastMarkerCluster
+from jinja2 import Template
+
+# 브라우저에서 점 하나([lat, lon, value])로 원 마커를 만드는 함수
+# 값이 vmin → vmax로 갈수록 노랑 → 빨강
+_MARKER_JS = """
+function (row) {{
+    var t = Math.min(Math.max((row[2] - {vmin}) / ({vmax} - {vmin}), 0), 1);
+    var color = "hsl(" + (55 - 55 * t) + ", 100%, 45%)";
+    var marker = L.circleMarker(new L.LatLng(row[0], row[1]), {{
+        radius: row[2] * {radius_scale},
+        color: color,
+        fillColor: color,
+        fillOpacity: 0.6,
+        weight: 1{renderer}
+    }});
+    marker.bindPopup("{label}: " + row[2].toFixed(1));
+    return marker;
+}}
+"""
+
+
+class BulkCircleLayer(MacroElement):
+    # 모든 원을 캔버스 하나에 그리는 레이어 (SVG 노드를 점마다 만들지 않음)
+    _template = Template("""
+        {% macro script(this, kwargs) %}
+        (function () {
+            var renderer = L.canvas({padding: 0.5});
+            var makeMarker = {{ this.marker_js }};
+            var data = {{ this.data }};
+            var layer = L.featureGroup();
+            for (var i = 0; i < data.length; i++) {
+                layer.addLayer(makeMarker(data[i]));
+            }
+            layer.addTo({{ this._parent.get_name() }});
+        })();
+        {% endmacro %}
+    """)
+
+    def __init__(self, data, marker_js):
+        super().__init__()
+        self._name = "BulkCircleLayer"
+        self.data = data
+        self.marker_js = marker_js
+
+
+def _points(lat, lon, values):
+    points = np.column_stack([lat, lon, values]).astype(np.float64)
+    # 소수점 셋째 자리(약 100m)면 지도 표시에 충분하고 전송량이 크게 준다
+    return np.round(points, 3).tolist()
+
+
+def add_circle_layer(m, lat, lon, values, cluster=False, radius_scale=1.5,
+                     vmin=2.0, vmax=7.0, label="Magnitude"):
+    """위도/경도/값 배열을 원 마커 레이어 하나로 지도 m에 올린다.
+
+    cluster=True면 FastMarkerCluster로 가까운 점을 묶어서 보여준다.
+    """
+    data = _points(lat, lon, values)
+    if cluster:
+        marker_js = _MARKER_JS.format(vmin=vmin, vmax=vmax, radius_scale=radius_scale, label=label, renderer="")
+        FastMarkerCluster(data, callback=marker_js).add_to(m)
+    else:
+        marker_js = _MARKER_JS.format(vmin=vmin, vmax=vmax, radius_scale=radius_scale, label=label,
+                                      renderer=",\n        renderer: renderer")
+        BulkCircleLayer(json.dumps(data, separators=(",", ":")), marker_js).add_to(m)
+    return m
+
+
+def add_grid_layer(m, cells, cell_size, value_key="max", vmin=2.0, vmax=7.0, label="최대 규모"):
+    """격자 집계(spatial_lod의 cells)를 칸별 색으로 칠한 GeoJSON 레이어 하나로 올린다."""
+    import folium
+    from branca.colormap import LinearColormap
+
+    colormap = LinearColormap(["#ffe066", "#d00000"], vmin=vmin, vmax=vmax, caption=label)
+    half = cell_size / 2
+    features = [
+        {
+            "type": "Feature",
+            "geometry": {"type": "Polygon", "coordinates": [[
+                [lon - half, lat - half], [lon + half, lat - half],
+                [lon + half, lat + half], [lon - half, lat + half], [lon - half, lat - half],
+            ]]},
+            "properties": {"value": round(value, 2), "count": count},
+        }
+        for lat, lon, value, count in zip(
+            cells["lat"].tolist(), cells["lon"].tolist(), cells[value_key].tolist(), cells["count"].tolist()
+        )
+    ]
+    folium.GeoJson(
+        {"type": "FeatureCollection", "features": features},
+        style_function=lambda feature: {
+            "fillColor": colormap(feature["properties"]["value"]),
+            "color": None,
+            "weight": 0,
+            "fillOpacity": 0.6,
+        },
+        tooltip=folium.GeoJsonTooltip(["count", "value"], aliases=["지진 수", label]),
+    ).add_to(m)
+    colormap.add_to(m)
+    return m
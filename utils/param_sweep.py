@@ -0,0 +1,147 @@
+"""슬라이더 조합 전체를 미리 계산해 브라우저에서만 움직이는 함수 그래프.
+
+매개변수 격자(예: a×b, k×φ)의 모든 조합을 NumPy 브로드캐스팅으로 한 번에 계산하고,
+int16으로 양자화한 배열 하나를 Plotly 그래프와 함께 HTML로 보낸다. 슬라이더를 움직이면
+브라우저가 배열에서 해당 조합의 y 값만 꺼내 다시 그리므로 서버는 아무 일도 하지 않는다.
+"""
+import base64
+import json
+
+import numpy as np
+
+_TEMPLATE = """
+<div id="sweep-plot" style="height: {plot_height}px;"></div>
+<div id="sweep-controls" style="display: flex; gap: 24px; font-family: sans-serif; font-size: 14px;"></div>
+<script src="{plotly_src}"></script>
+<script>
+(function () {{
+    var spec = {spec};
+    var raw = atob(spec.data);
+    var bytes = new Uint8Array(raw.length);
+    for (var i = 0; i < raw.length; i++) bytes[i] = raw.charCodeAt(i);
+    var grid = new Int16Array(bytes.buffer);
+    var nx = spec.x.length;
+
+    // 슬라이더 하나당 매개변수 하나 (격자 축 + 브라우저에서 곱하는 배율)
+    var params = spec.params.concat(spec.scale ? [spec.scale] : []);
+    var index = params.map(function (p) {{ return p.index; }});
+    var controls = document.getElementById("sweep-controls");
+    var labels = params.map(function (p, i) {{
+        var box = document.createElement("label");
+        box.style.flex = "1";
+        var text = document.createElement("div");
+        var input = document.createElement("input");
+        input.type = "range";
+        input.min = 0;
+        input.max = p.values.length - 1;
+        input.step = 1;
+        input.value = p.index;
+        input.style.width = "100%";
+        input.addEventListener("input", function () {{
+            index[i] = Number(input.value);
+            draw();
+        }});
+        box.appendChild(text);
+        box.appendChild(input);
+        controls.appendChild(box);
+        return text;
+    }});
+
+    function draw() {{
+        var offset = 0;
+        for (var i = 0; i < spec.params.length; i++) offset = offset * spec.params[i].values.length + index[i];
+        var factor = spec.scale ? spec.scale.values[index[params.length - 1]] : 1;
+        var y = new Array(nx);
+        for (var j = 0; j < nx; j++) y[j] = grid[offset * nx + j] * spec.step * factor;
+
+        var title = spec.title;
+        params.forEach(function (p, i) {{
+            var value = p.values[index[i]].toFixed(p.digits);
+            labels[i].textContent = p.label + ": " + value;
+            title = title.split("{{" + p.name + "}}").join(value);
+        }});
+        Plotly.react("sweep-plot", [{{x: spec.x, y: y, mode: "lines", name: title}}], {{
+            title: {{text: title}},
+            xaxis: {{title: {{text: "x"}}, zeroline: true, zerolinecolor: "grey"}},
+            yaxis: {{title: {{text: "y"}}, zeroline: true, zerolinecolor: "grey"}},
+            margin: {{t: 50, r: 20, b: 50, l: 60}},
+            showlegend: false
+        }}, {{responsive: true}});
+    }}
+    draw();
+}})();
+</script>
+"""
+
+
+def _plotly_src():
+    # 설치된 plotly 패키지와 같은 버전의 plotly.js를 CDN에서 받는다 (fig.to_html과 같은 방식)
+    from plotly.offline import get_plotlyjs_version
+
+    return f"https://cdn.plot.ly/plotly-{get_plotlyjs_version()}.min.js"
+
+
+def slider_values(start, stop, step):
+    # st.slider(start, stop, value, step)이 고를 수 있는 값들
+    count = int(round((stop - start) / step)) + 1
+    return np.round(start + step * np.arange(count), 6)
+
+
+def _param(name, label, values, default, digits):
+    values = np.asarray(values, dtype=np.float64)
+    return {
+        "name": name, "label": label, "values": values.tolist(), "digits": digits,
+        "index": int(np.abs(values - default).argmin()),
+    }
+
+
+def sweep_html(x, grid, params, title, scale=None, plot_height=450):
+    """미리 계산한 격자 grid[축1, 축2, ..., x]를 브라우저 슬라이더로 넘겨 보는 HTML을 만든다.
+
+    params: (이름, 라벨, 값 배열, 기본값, 소수 자릿수) 목록, grid의 앞쪽 축 순서와 같아야 한다.
+    scale: 같은 형식의 매개변수 하나. y에 곱하기만 하면 되는 값(진폭 등)은 격자에 넣지 않고
+    브라우저에서 곱해서 보낼 데이터 양을 줄인다.
+    title: "{이름}" 자리에 현재 값이 들어가는 그래프 제목.
+    """
+    grid = np.asarray(grid, dtype=np.float64)
+    # int16 양자화: 최대 절댓값을 32767 칸으로 나눈다
+    step = float(np.abs(grid).max()) / 32767 or 1.0
+    quantized = np.round(grid / step).astype("<i2")
+    spec = {
+        "x": np.round(np.asarray(x, dtype=np.float64), 4).tolist(),
+        "data": base64.b64encode(quantized.tobytes()).decode("ascii"),
+        "step": step,
+        "params": [_param(*p) for p in params],
+        "scale": _param(*scale) if scale else None,
+        "title": title,
+    }
+    return _TEMPLATE.format(
+        plot_height=plot_height, plotly_src=_plotly_src(), spec=json.dumps(spec, separators=(",", ":")),
+    )
+
+
+def linear_sweep_html(x_range=(-10, 10), n_x=41):
+    # y = ax + b는 직선이라 x 점이 적어도 모양이 정확하다
+    x = np.linspace(*x_range, n_x)
+    a_values = slider_values(-5.0, 5.0, 0.1)
+    b_values = slider_values(-10.0, 10.0, 0.5)
+    grid = a_values[:, None, None] * x + b_values[None, :, None]
+    return sweep_html(
+        x, grid,
+        [("a", "기울기 (a)", a_values, 1.0, 1), ("b", "y 절편 (b)", b_values, 0.0, 1)],
+        "1차 함수: y = {a}x + {b}",
+    )
+
+
+def sine_sweep_html(n_x=200):
+    # 진폭은 y에 곱하기만 하면 되므로 격자는 k×φ×x만 계산한다
+    x = np.linspace(-2 * np.pi, 2 * np.pi, n_x)
+    k_values = slider_values(0.1, 5.0, 0.1)
+    phase_values = slider_values(-3.1, 3.1, 0.1)
+    grid = np.sin(k_values[:, None, None] * x + phase_values[None, :, None])
+    return sweep_html(
+        x, grid,
+        [("k", "파수 (k)", k_values, 1.0, 1), ("phase", "위상 (φ)", phase_values, 0.0, 2)],
+        "사인 파동: A={A}, k={k}, φ={phase}",
+        scale=("A", "진폭 (A)", slider_values(0.1, 5.0, 0.1), 1.0, 1),
+    )
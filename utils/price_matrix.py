@@ -0,0 +1,178 @@
+"""여러 티커의 종가를 날짜×티커 float32 행렬 하나로 정렬하고 지표를 계산한다.
+
+수익률, 100 기준 정규화, 이동평균, 낙폭(drawdown), 상관계수를 티커별 pandas 반복
+없이 행렬 단위 NumPy 연산으로 한 번에 계산한다. PriceEngine은 (티커 집합, 기간)
+별로 행렬을 기억해 두어, 같은 조건의 재실행에서는 다시 계산하지 않는다.
+"""
+import threading
+from collections import OrderedDict
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+
+from utils.downsample import downsample_series
+
+DOWNSAMPLE_ENTRIES = 32
+
+
+class PriceMatrix:
+    def __init__(self, dates, tickers, values):
+        self.dates = dates            # DatetimeIndex (행)
+        self.tickers = list(tickers)  # 티커 목록 (열)
+        self.values = values          # float32 (날짜 수, 티커 수), 거래가 없는 날은 NaN
+        self.missing = []             # 불러오지 못한 티커
+        self.errors = {}              # 불러오지 못한 티커 -> 실패 이유 (없으면 None)
+        self._moving_averages = {}
+        self._downsampled = OrderedDict()
+
+    @classmethod
+    def from_frames(cls, frames, column="Close"):
+        # frames: {티커: 일봉 DataFrame}. 거래일이 다른 시장도 날짜 합집합 기준으로 맞춘다
+        frames = {ticker: data for ticker, data in frames.items() if data is not None and len(data)}
+        if not frames:
+            return cls(pd.DatetimeIndex([]), [], np.empty((0, 0), dtype=np.float32))
+        dates = frames[next(iter(frames))].index
+        for data in frames.values():
+            dates = dates.union(data.index)
+
+        values = np.full((len(dates), len(frames)), np.nan, dtype=np.float32)
+        for j, data in enumerate(frames.values()):
+            values[dates.get_indexer(data.index), j] = data[column].to_numpy(dtype=np.float32)
+        return cls(dates, frames.keys(), values)
+
+    @cached_property
+    def filled(self):
+        # 휴장일은 직전 종가로 채운다 (첫 거래일 이전은 NaN 유지)
+        values = self.values
+        rows = np.where(np.isnan(values), 0, np.arange(len(values))[:, None])
+        np.maximum.accumulate(rows, axis=0, out=rows)
+        return values[rows, np.arange(values.shape[1])]
+
+    @cached_property
+    def returns(self):
+        # 거래일 수익률: 값이 있는 날마다 직전 거래일 종가 대비. 거래가 없는 날(휴장, 다른 시장
+        # 달력)은 0이 아니라 NaN (앞으로 채운 값은 화면 표시용으로만 쓴다)
+        values = self.values
+        previous = self.filled[:-1]   # 직전 행까지의 마지막 거래일 종가
+        out = np.full_like(values, np.nan)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            out[1:] = values[1:] / previous - 1
+        return out
+
+    @cached_property
+    def normalized(self):
+        # 각 티커의 첫 종가를 100으로 맞춘 상대 성과 (통화가 달라도 비교 가능)
+        filled = self.filled
+        if not len(filled):
+            return filled
+        first_rows = np.argmax(~np.isnan(filled), axis=0)
+        first = filled[first_rows, np.arange(filled.shape[1])]
+        return filled / first * 100
+
+    @cached_property
+    def drawdown(self):
+        # 그때까지의 최고가 대비 하락률 (0 이하)
+        filled = self.filled
+        peak = np.fmax.accumulate(filled, axis=0)
+        return filled / peak - 1
+
+    @cached_property
+    def correlation(self):
+        # 일간 수익률의 상관계수 행렬. 두 티커가 모두 거래한 날만 골라 그 날들 사이의 수익률로 계산한다
+        # (거래 달력이 다른 시장끼리도 같은 기간의 수익률끼리 비교하도록, pairwise)
+        values = self.values.astype(np.float64)
+        valid = ~np.isnan(values)
+        n, k = values.shape
+        row = np.arange(n)[:, None]
+        corr = np.full((k, k), np.nan)
+        for i in range(k):
+            # 티커 i와 j >= i 전부에 대해 한 번에: 둘 다 거래한 직전 행(prev)부터 이번 행까지의 수익률
+            rest = values[:, i:]
+            both = valid[:, [i]] & valid[:, i:]
+            prev = np.maximum.accumulate(np.where(both, row, -1), axis=0)
+            prev = np.vstack([np.full((1, k - i), -1), prev[:-1]])
+            use = both & (prev >= 0)
+            prev = np.maximum(prev, 0)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                x = np.where(use, values[:, [i]] / values[prev, i] - 1, 0.0)
+                y = np.where(use, rest / np.take_along_axis(rest, prev, axis=0) - 1, 0.0)
+                count = use.sum(axis=0)
+                mean_x, mean_y = x.sum(axis=0) / count, y.sum(axis=0) / count
+                cov = (x * y).sum(axis=0) / count - mean_x * mean_y
+                var_x = (x * x).sum(axis=0) / count - mean_x ** 2
+                var_y = (y * y).sum(axis=0) / count - mean_y ** 2
+                corr[i, i:] = corr[i:, i] = np.where(count >= 2, cov / np.sqrt(var_x * var_y), np.nan)
+        corr = np.clip(corr, -1, 1)
+        return pd.DataFrame(corr, index=self.tickers, columns=self.tickers)
+
+    def moving_average(self, window):
+        # 티커마다 자기 거래일(값이 있는 행)만으로 누적합 차분 이동평균을 구해 원래 행에 되돌려 놓는다
+        # (다른 시장 달력의 행을 채운 값으로 세면 "window 거래일" 평균이 아니게 된다).
+        # 거래가 없는 날과 창이 다 차기 전은 NaN
+        if window not in self._moving_averages:
+            out = np.full(self.values.shape, np.nan, dtype=np.float32)
+            for j in range(self.values.shape[1]):
+                rows = np.flatnonzero(~np.isnan(self.values[:, j]))
+                if len(rows) < window:
+                    continue
+                csum = np.concatenate([[0.0], np.cumsum(self.values[rows, j], dtype=np.float64)])
+                out[rows[window - 1:], j] = (csum[window:] - csum[:-window]) / window
+            self._moving_averages[window] = out
+        return self._moving_averages[window]
+
+    def lines(self, values, start, stop):
+        # 차트에 그릴 티커별 (날짜, 값). 그 티커가 거래하지 않은 날(NaN)은 빼서 선이 끊기지 않게 한다
+        dates = self.dates[start:stop]
+        lines = []
+        for j in range(values.shape[1]):
+            column = values[start:stop, j]
+            valid = ~np.isnan(column)
+            lines.append((dates[valid], column[valid]))
+        return lines
+
+    def downsampled(self, name, values, start, stop, width):
+        # 차트용으로 LTTB로 줄인 선들 [(날짜, 값), ...]. 행렬은 PriceEngine에 남아 있으므로
+        # (지표, 표시 구간, 너비)별로 기억해 두면 재실행에서는 다시 줄이지 않는다
+        key = (name, start, stop, width)
+        lines = self._downsampled.get(key)
+        if lines is None:
+            dates = self.dates[start:stop]
+            lines = [downsample_series(dates, values[start:stop, j], width) for j in range(values.shape[1])]
+            self._downsampled[key] = lines
+            while len(self._downsampled) > DOWNSAMPLE_ENTRIES:
+                self._downsampled.popitem(last=False)
+        return lines
+
+    def frame(self, values):
+        # 지표 행렬을 차트/표에서 쓰기 쉬운 DataFrame으로 감싼다
+        return pd.DataFrame(values, index=self.dates, columns=self.tickers)
+
+
+class PriceEngine:
+    def __init__(self, load_frames, max_entries=16):
+        # load_frames(tickers, start, end) -> FetchResult (data: {티커: 일봉 DataFrame}, errors: {티커: 예외})
+        self.load_frames = load_frames
+        self.max_entries = max_entries
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def matrix(self, tickers, start, end):
+        key = (tuple(sorted(tickers)), str(start), str(end))
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+
+        result = self.load_frames(list(tickers), start, end)
+        matrix = PriceMatrix.from_frames({ticker: result.data.get(ticker) for ticker in tickers})
+        matrix.missing = [ticker for ticker in tickers if ticker not in matrix.tickers]
+        matrix.errors = {ticker: result.errors.get(ticker) for ticker in matrix.missing}
+        # 일부 티커가 실패한 결과는 기억하지 않고 다음 실행에서 다시 시도한다
+        if matrix.missing:
+            return matrix
+        with self._lock:
+            self._cache[key] = matrix
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return matrix
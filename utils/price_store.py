@@ -0,0 +1,146 @@
+"""주식 일봉(OHLCV) 로컬 저장소.
+
+티커마다 Parquet 파일 하나에 일봉 데이터를 저장하고, 저장된 날짜 구간(coverage)을
+JSON 파일에 함께 기록해 둔다. 요청 구간 중 저장소에 없는 부분만 fetcher로 받아서
+이어 붙이므로, 한 번 받은 과거 데이터는 다시 네트워크로 받지 않는다.
+"""
+import json
+import os
+import threading
+from pathlib import Path
+from urllib.parse import quote
+
+import pandas as pd
+
+from utils.config import CACHE_DIR
+
+
+class DownloadError(RuntimeError):
+    """yfinance가 데이터를 돌려주지 못했을 때 (재시도/실패 보고가 동작하도록 예외로 바꾼다)."""
+
+
+def yf_fetcher(ticker, start, end):
+    # 기본 fetcher: yfinance에서 [start, end) 구간 일봉을 받아온다
+    import yfinance as yf
+
+    data = yf.download(ticker, start=start, end=end, progress=False)
+    # yf.download는 실패해도 예외 없이 빈 표를 돌려주고 오류는 로그로만 남긴다
+    # (0.2대 버전은 yf.shared._ERRORS에도 기록한다)
+    error = getattr(getattr(yf, "shared", None), "_ERRORS", {}).get(ticker)
+    if error or data is None or data.dropna(how="all").empty:
+        raise DownloadError(f"{ticker} {start}~{end}: {error or '받은 데이터가 없습니다'}")
+    # 최신 yfinance는 단일 티커도 (항목, 티커) 2단 컬럼으로 돌려준다
+    if isinstance(data.columns, pd.MultiIndex):
+        data.columns = data.columns.get_level_values(0)
+    return data
+
+
+def _today():
+    return pd.Timestamp.today().normalize()
+
+
+class PriceStore:
+    def __init__(self, root=None, fetcher=yf_fetcher):
+        self.root = Path(root) if root else CACHE_DIR / "prices"
+        self.root.mkdir(parents=True, exist_ok=True)
+        # fetcher(ticker, start, end) -> DataFrame, 테스트에서는 로컬 대체 함수를 넣는다
+        self.fetcher = fetcher
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+
+    def _lock(self, ticker):
+        with self._locks_guard:
+            return self._locks.setdefault(ticker, threading.Lock())
+
+    def _paths(self, ticker):
+        name = quote(ticker, safe="")
+        return self.root / f"{name}.parquet", self.root / f"{name}.json"
+
+    def _load(self, ticker):
+        data_path, meta_path = self._paths(ticker)
+        if not (data_path.exists() and meta_path.exists()):
+            return None, None
+        meta = json.loads(meta_path.read_text())
+        data = pd.read_parquet(data_path)
+        coverage = (pd.Timestamp(meta["start"]), pd.Timestamp(meta["end"]))
+        # fetched: 마지막으로 받은 날. 그날 기준 오늘/미래였던 구간은 그날 안에서만 받은 것으로 보고,
+        # 다음 날부터는 마지막으로 저장된 거래일부터 다시 받는다 (장중에 받은 종가를 확정 종가로 바꿈)
+        fetched = pd.Timestamp(meta.get("fetched", meta["end"]))
+        if coverage[1] > fetched and _today() > fetched and len(data):
+            coverage = (coverage[0], min(coverage[1], data.index.max()))
+        return data, coverage
+
+    def _save(self, ticker, data, coverage, write_data=True):
+        data_path, meta_path = self._paths(ticker)
+        if write_data:
+            # 임시 파일에 쓴 뒤 교체해서, 중간에 끊겨도 깨진 파일이 남지 않게 한다
+            tmp_path = data_path.with_suffix(".parquet.tmp")
+            data.to_parquet(tmp_path)
+            os.replace(tmp_path, data_path)
+        meta_path.write_text(json.dumps({
+            "start": coverage[0].isoformat(),
+            "end": coverage[1].isoformat(),
+            "fetched": _today().isoformat(),
+        }))
+
+    @staticmethod
+    def missing_ranges(coverage, start, end):
+        # 저장된 구간이 하나로 이어지도록, 앞/뒤로 모자란 부분을 [s, e) 목록으로 돌려준다
+        if coverage is None:
+            return [(start, end)]
+        covered_start, covered_end = coverage
+        ranges = []
+        if start < covered_start:
+            ranges.append((start, covered_start))
+        if end > covered_end:
+            ranges.append((covered_end, end))
+        return ranges
+
+    def get(self, ticker, start, end):
+        start, end = pd.Timestamp(start), pd.Timestamp(end)
+        with self._lock(ticker):
+            data, coverage = self._load(ticker)
+            missing = self.missing_ranges(coverage, start, end)
+            if missing:
+                stored = data
+                parts = [data] if data is not None else []
+                new_start, new_end = coverage if coverage else (None, None)
+                failures = []
+                for fetch_start, fetch_end in missing:
+                    try:
+                        fetched = self.fetcher(
+                            ticker,
+                            fetch_start.strftime("%Y-%m-%d"),
+                            fetch_end.strftime("%Y-%m-%d"),
+                        )
+                    except Exception as e:
+                        failures.append(e)
+                        continue
+                    # 빈 결과는 네트워크 오류일 수도 있으므로 받은 구간으로 기록하지 않는다 (다음에 다시 받음)
+                    if fetched is None or not len(fetched):
+                        continue
+                    parts.append(fetched)
+                    new_start = fetch_start if new_start is None else min(new_start, fetch_start)
+                    new_end = fetch_end if new_end is None else max(new_end, fetch_end)
+
+                if not parts:
+                    if failures:
+                        raise failures[0]
+                    return pd.DataFrame()
+                data = pd.concat(parts)
+                data = data[~data.index.duplicated(keep="last")].sort_index()
+
+                # 요청한 끝(미래여도)까지 받은 것으로 기록한다. 오늘/미래 부분은 fetched로 다음 날 다시 받는다.
+                # 받은 행이 저장된 것과 같으면 Parquet는 다시 쓰지 않는다
+                if new_start is not None and (new_start, new_end) != coverage:
+                    changed = stored is None or not data.equals(stored)
+                    self._save(ticker, data, (new_start, new_end), write_data=changed)
+
+                # 요청 구간에 저장된 행이 하나도 없으면 실패로 알린다 (재시도/실패 보고)
+                # 휴장일뿐인 짧은 구간처럼 일부만 비면 있는 데이터를 돌려주고 다음에 다시 받는다
+                window = data.loc[(data.index >= start) & (data.index < end)]
+                if failures and window.empty:
+                    raise failures[0]
+                return window
+
+        return data.loc[(data.index >= start) & (data.index < end)]
@@ -0,0 +1,307 @@
+"""페이지 재실행 성능 측정 (사이드바 패널 + JSONL 로그). 켜야만 동작한다.
+
+페이지 맨 위에서 profile_page(), 맨 아래에서 show_profile()을 부른다. 사이드바의
+'성능 측정' 체크박스(또는 환경 변수 A1_PROFILE=1)를 켜면, 재실행마다 구간별 걸린 시간,
+처리한 행 수, 브라우저로 보낸 데이터 양, 프로세스 최대 RSS를 기록한다.
+
+- 엑셀 읽기, 가격 데이터 받기처럼 우리 코드의 구간은 section()으로 감싼다.
+- seaborn 그리기 함수, st.pyplot(PNG 인코딩), folium HTML 생성은 측정을 처음 켤 때
+  라이브러리 함수를 감싸 자동으로 잰다.
+- 보낸 데이터 양은 Streamlit이 세션으로 보내는 메시지 크기와 미디어 파일(이미지) 크기의 합이다.
+
+세션마다 최근 재실행 기록을 보관하고 CSV로 내려받을 수 있으며, 모든 기록은
+CACHE_DIR/profile.jsonl에 한 줄씩 쌓인다. st.stop()/st.rerun()이나 오류로 중간에 끝난 재실행은
+기록되지 않고, 그 측정은 재실행이 끝날 때 버린다.
+"""
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+
+from utils.config import CACHE_DIR
+
+LOG_PATH = CACHE_DIR / "profile.jsonl"
+LOG_MAX_BYTES = 10 * 1024 ** 2
+HISTORY_SIZE = 50
+
+# 자동으로 감쌀 seaborn 그리기 함수
+SEABORN_FUNCTIONS = ("histplot", "kdeplot", "boxplot", "barplot", "lineplot", "scatterplot", "heatmap")
+
+_lock = threading.Lock()
+_active = {}          # 세션 ID -> 지금 측정 중인 RerunProfile
+_installed = False
+
+
+def peak_rss_mb():
+    # 프로세스가 지금까지 쓴 최대 메모리 (리눅스는 KB, macOS는 바이트 단위)
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 ** 2 if sys.platform == "darwin" else peak / 1024
+
+
+@dataclass
+class Section:
+    name: str
+    seconds: float = 0.0
+    rows: int = None
+    payload_bytes: int = 0
+    peak_rss_mb: float = None
+
+
+@dataclass
+class RerunProfile:
+    page: str
+    session_id: str
+    started: float = field(default_factory=time.time)
+    sections: list = field(default_factory=list)
+    payload_bytes: int = 0
+    seconds: float = 0.0
+    peak_rss_mb: float = None
+    rss_growth_mb: float = None
+    _start_clock: float = field(default_factory=time.perf_counter, repr=False)
+    _start_rss: float = field(default_factory=lambda: peak_rss_mb(), repr=False)
+
+    def add_payload(self, size):
+        with _lock:
+            self.payload_bytes += size
+
+    def finish(self):
+        self.seconds = time.perf_counter() - self._start_clock
+        self.peak_rss_mb = peak_rss_mb()
+        if self.peak_rss_mb is not None and self._start_rss is not None:
+            self.rss_growth_mb = self.peak_rss_mb - self._start_rss
+
+    def record(self):
+        return {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.started)),
+            "session": self.session_id,
+            "page": self.page,
+            "seconds": round(self.seconds, 4),
+            "payload_bytes": self.payload_bytes,
+            "peak_rss_mb": self.peak_rss_mb,
+            "rss_growth_mb": self.rss_growth_mb,
+            "sections": [asdict(s) for s in self.sections],
+        }
+
+
+def _current_profile():
+    # 스크립트 스레드에서만 세션을 알 수 있다 (스레드 풀 작업은 측정하지 않음)
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    ctx = get_script_run_ctx(suppress_warning=True)
+    return _active.get(ctx.session_id) if ctx is not None else None
+
+
+@contextmanager
+def section(name, rows=None):
+    """with section("엑셀 읽기") as s: ... s.rows = len(df) 처럼 쓴다. 측정이 꺼져 있으면 아무것도 안 한다."""
+    profile = _current_profile()
+    current = Section(name, rows=rows)
+    if profile is None:
+        yield current
+        return
+    payload_before = profile.payload_bytes
+    start = time.perf_counter()
+    try:
+        yield current
+    finally:
+        current.seconds = time.perf_counter() - start
+        current.payload_bytes = max(current.payload_bytes, profile.payload_bytes - payload_before)
+        current.peak_rss_mb = peak_rss_mb()
+        profile.sections.append(current)
+
+
+def _rows_of(args, kwargs):
+    data = kwargs.get("data")
+    if data is None:
+        data = kwargs.get("x", args[0] if args else None)
+    try:
+        return len(data)
+    except TypeError:
+        return None
+
+
+def _wrap(function, name, count_rows=False):
+    if getattr(function, "_profiled", False):
+        return function
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        with section(name, rows=_rows_of(args, kwargs) if count_rows else None):
+            return function(*args, **kwargs)
+
+    wrapper._profiled = True
+    return wrapper
+
+
+def _install():
+    """라이브러리 함수들을 측정용으로 감싼다 (프로세스에서 처음 측정을 켤 때 한 번)."""
+    global _installed
+    with _lock:
+        if _installed:
+            return
+        _installed = True
+
+    import streamlit
+
+    streamlit.pyplot = _wrap(streamlit.pyplot, "st.pyplot (PNG 인코딩)")
+
+    try:
+        import seaborn
+    except ImportError:
+        pass
+    else:
+        for function_name in SEABORN_FUNCTIONS:
+            setattr(seaborn, function_name,
+                    _wrap(getattr(seaborn, function_name), f"seaborn.{function_name}", count_rows=True))
+
+    try:
+        from branca.element import Figure
+    except ImportError:
+        pass
+    else:
+        render = Figure.render
+
+        @functools.wraps(render)
+        def render_with_profile(self, **kwargs):
+            with section("folium HTML 생성") as current:
+                html = render(self, **kwargs)
+                current.payload_bytes = len(html.encode("utf-8"))
+            return html
+
+        Figure.render = render_with_profile
+
+    # 브라우저로 보내는 양: 세션 메시지(ForwardMsg) 크기 + 미디어 파일(이미지 등) 크기
+    try:
+        from streamlit.runtime.media_file_manager import MediaFileManager
+        from streamlit.runtime.scriptrunner import script_runner
+        from streamlit.runtime.scriptrunner_utils.script_run_context import ScriptRunContext
+    except ImportError:
+        return
+    enqueue = ScriptRunContext.enqueue
+
+    @functools.wraps(enqueue)
+    def enqueue_with_profile(self, msg):
+        profile = _active.get(self.session_id)
+        if profile is not None:
+            profile.add_payload(msg.ByteSize())
+        return enqueue(self, msg)
+
+    add = MediaFileManager.add
+
+    @functools.wraps(add)
+    def add_with_profile(self, path_or_data, *args, **kwargs):
+        profile = _current_profile()
+        if profile is not None:
+            if isinstance(path_or_data, (bytes, bytearray)):
+                profile.add_payload(len(path_or_data))
+            elif isinstance(path_or_data, str) and os.path.exists(path_or_data):
+                profile.add_payload(os.path.getsize(path_or_data))
+        return add(self, path_or_data, *args, **kwargs)
+
+    # 재실행 한 번(st.rerun()으로 이어지는 각 실행, 프래그먼트 실행 포함)을 감싸는 함수
+    exec_with_error_handling = script_runner.exec_func_with_error_handling
+
+    @functools.wraps(exec_with_error_handling)
+    def exec_with_profile(func, ctx):
+        # 재실행이 어떻게 끝나든(st.stop(), st.rerun(), 오류 포함) 이 세션의 측정을 닫는다.
+        # show_profile까지 가지 못한 측정이 남아 있으면 다음 재실행의 전송량이 거기에 더해진다
+        try:
+            return exec_with_error_handling(func, ctx)
+        finally:
+            _active.pop(ctx.session_id, None)
+
+    ScriptRunContext.enqueue = enqueue_with_profile
+    MediaFileManager.add = add_with_profile
+    script_runner.exec_func_with_error_handling = exec_with_profile
+
+
+def profile_page(page):
+    """페이지 맨 위에서 부른다. 사이드바에 측정 스위치를 놓고, 켜져 있으면 이번 재실행 측정을 시작한다."""
+    import streamlit as st
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    enabled = st.sidebar.checkbox(
+        "⏱ 성능 측정", value=os.environ.get("A1_PROFILE") == "1", key="profiler_enabled",
+        help="재실행마다 구간별 시간, 행 수, 전송량, 최대 메모리를 기록합니다."
+    )
+    ctx = get_script_run_ctx(suppress_warning=True)
+    if ctx is None:
+        return None
+    if not enabled:
+        _active.pop(ctx.session_id, None)
+        return None
+    _install()
+    profile = RerunProfile(page, ctx.session_id)
+    _active[ctx.session_id] = profile
+    return profile
+
+
+def _write_log(record):
+    try:
+        LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
+        if LOG_PATH.exists() and LOG_PATH.stat().st_size > LOG_MAX_BYTES:
+            os.replace(LOG_PATH, LOG_PATH.with_suffix(".jsonl.1"))
+        with _lock, open(LOG_PATH, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    except OSError:
+        pass
+
+
+def history_frame(history):
+    """재실행 기록들을 구간별 한 줄씩의 표로 편다 (CSV 내보내기용)."""
+    import pandas as pd
+
+    rows = []
+    for record in history:
+        base = {"시각": record["time"], "페이지": record["page"]}
+        rows.append({**base, "구간": "(재실행 전체)", "시간 (초)": record["seconds"], "행 수": None,
+                     "전송량 (KB)": record["payload_bytes"] / 1024, "최대 RSS (MB)": record["peak_rss_mb"]})
+        for s in record["sections"]:
+            rows.append({**base, "구간": s["name"], "시간 (초)": round(s["seconds"], 4), "행 수": s["rows"],
+                         "전송량 (KB)": s["payload_bytes"] / 1024, "최대 RSS (MB)": s["peak_rss_mb"]})
+    return pd.DataFrame(rows, columns=["시각", "페이지", "구간", "시간 (초)", "행 수", "전송량 (KB)", "최대 RSS (MB)"]).astype({"행 수": "Int64"})
+
+
+def show_profile():
+    """페이지 맨 아래에서 부른다. 이번 재실행 측정을 마치고 기록한 뒤 사이드바 패널을 그린다."""
+    import streamlit as st
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    ctx = get_script_run_ctx(suppress_warning=True)
+    profile = _active.pop(ctx.session_id, None) if ctx is not None else None
+    if profile is None:
+        return
+    profile.finish()
+    record = profile.record()
+    _write_log(record)
+    history = st.session_state.setdefault("profiler_history", deque(maxlen=HISTORY_SIZE))
+    history.append(record)
+
+    with st.sidebar.expander("⏱ 이번 재실행 측정", expanded=True):
+        col_time, col_payload, col_rss = st.columns(3)
+        col_time.metric("시간", f"{profile.seconds:.2f}s")
+        col_payload.metric("전송량", f"{profile.payload_bytes / 1024:,.0f} KB")
+        if profile.peak_rss_mb is not None:
+            col_rss.metric("최대 RSS", f"{profile.peak_rss_mb:,.0f} MB",
+                           delta=f"{profile.rss_growth_mb:+,.0f} MB" if profile.rss_growth_mb else None,
+                           delta_color="inverse")
+        table = history_frame([record])
+        st.dataframe(table.drop(columns=["시각", "페이지"]), hide_index=True, use_container_width=True)
+
+        st.caption(f"최근 재실행 {len(history)}회 (세션별, 최대 {HISTORY_SIZE}회)")
+        st.line_chart([r["seconds"] for r in history], height=120)
+        st.download_button(
+            "기록 CSV로 내려받기",
+            history_frame(history).to_csv(index=False).encode("utf-8-sig"),
+            file_name="profile_history.csv",
+            mime="text/csv",
+        )
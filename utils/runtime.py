@@ -0,0 +1,127 @@
+"""모든 페이지가 함께 쓰는 그래프 실행 환경 (한글 폰트 설정, 무거운 라이브러리 지연 로딩).
+
+한글 폰트는 프로세스마다 font_manager로 찾지 않고, 한 번 찾은 결과를 .cache/font.json에
+저장해 두었다가 다음 실행부터 그대로 쓴다. matplotlib, seaborn, folium 같은 무거운 모듈은
+lazy_import로 받아 두면 그 모듈을 실제로 쓰는 화면에서 처음 접근할 때 불러온다.
+"""
+import importlib.util
+import json
+import os
+import platform
+import sys
+import threading
+import types
+
+from utils.config import CACHE_DIR
+
+FONT_CACHE_PATH = CACHE_DIR / "font.json"
+
+# 운영체제별로 먼저 찾아볼 한글 폰트
+KOREAN_FONTS = {
+    "Darwin": ("AppleGothic",),
+    "Windows": ("Malgun Gothic",),
+    "Linux": ("NanumGothic", "Noto Sans CJK KR", "UnDotum"),
+}
+
+_font_lock = threading.Lock()
+_font = {}
+
+
+class _LazyModule(types.ModuleType):
+    # 처음 속성에 접근할 때 진짜 모듈을 불러와 그 속성을 넘겨주는 대리 모듈.
+    # importlib.util.LazyLoader는 3.11에서 스레드에 안전하지 않아(세션 스레드 둘이 동시에 처음
+    # 접근하면 반쯤 초기화된 모듈을 볼 수 있다) 잠금 안에서 일반 import로 불러온다
+    def __init__(self, name):
+        super().__init__(name)
+        self._lock = threading.Lock()
+        self._module = None
+
+    def __getattr__(self, attr):
+        # 모듈 객체 자체에 없는 속성일 때만 불린다
+        module = self._module
+        if module is None:
+            with self._lock:
+                if self._module is None:
+                    self._module = importlib.import_module(self.__name__)
+                module = self._module
+        return getattr(module, attr)
+
+
+def lazy_import(name):
+    """처음 속성에 접근할 때 실제로 불러오는 모듈을 돌려준다 (이미 불러왔으면 그 모듈)."""
+    if name in sys.modules:
+        return sys.modules[name]
+    if importlib.util.find_spec(name) is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+    return _LazyModule(name)
+
+
+def _read_font_cache(system):
+    try:
+        with open(FONT_CACHE_PATH, encoding="utf-8") as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    # 다른 OS에서 만든 캐시이거나, 폰트를 못 찾았었거나, 폰트 파일이 지워졌으면 다시 찾는다
+    if cached.get("system") != system or not cached.get("path") or not os.path.exists(cached["path"]):
+        return None
+    return cached
+
+
+def _discover_font(system):
+    import matplotlib.font_manager as fm
+
+    for family in KOREAN_FONTS.get(system, ()):
+        try:
+            path = fm.findfont(fm.FontProperties(family=family), fallback_to_default=False)
+        except ValueError:
+            continue
+        return {"system": system, "family": family, "path": path}
+    return {"system": system, "family": None, "path": None}
+
+
+def resolve_korean_font():
+    """쓸 수 있는 한글 폰트 이름 (없으면 None). 디스크 캐시 → 폰트 검색 순서로 찾는다."""
+    with _font_lock:
+        if "family" not in _font:
+            system = platform.system()
+            cached = _read_font_cache(system)
+            if cached is None:
+                cached = _discover_font(system)
+                try:
+                    FONT_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+                    tmp_path = FONT_CACHE_PATH.with_suffix(".json.tmp")
+                    tmp_path.write_text(json.dumps(cached, ensure_ascii=False), encoding="utf-8")
+                    os.replace(tmp_path, FONT_CACHE_PATH)
+                except OSError:
+                    pass
+            _font["family"] = cached["family"]
+        return _font["family"]
+
+
+def setup_matplotlib():
+    """기본 Figure 크기, 마이너스 기호, 한글 폰트를 설정하고 폰트 이름을 돌려준다.
+
+    rcParams 설정은 가벼우므로 매번 다시 적용하고, 폰트 검색만 한 번 한다.
+    """
+    import matplotlib
+
+    # Streamlit의 "wide" 레이아웃에서 8x5는 화면 절반 정도
+    matplotlib.rcParams["figure.figsize"] = (8, 5)
+    # 마이너스 기호 깨짐 방지
+    matplotlib.rcParams["axes.unicode_minus"] = False
+    family = resolve_korean_font()
+    if family:
+        matplotlib.rcParams["font.family"] = family
+    return family
+
+
+def use_korean_font():
+    """페이지 맨 위에서 부른다. 리눅스에서 한글 폰트가 없으면 설치 방법을 안내한다."""
+    import streamlit as st
+
+    family = setup_matplotlib()
+    if family is None and platform.system() == "Linux":
+        st.warning("리눅스 환경에서 'NanumGothic' 폰트를 찾을 수 없습니다. "
+                   "폰트가 깨져 보일 수 있습니다. 'sudo apt-get install fonts-nanum' 등으로 설치해 주세요.")
+    return family
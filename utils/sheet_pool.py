@@ -0,0 +1,151 @@
+"""여러 시트가 있는 엑셀 통합 문서를 작업 프로세스들에서 시트별로 동시에 읽는다.
+
+업로드 파일 바이트는 공유 메모리(multiprocessing.shared_memory)에 한 번만 올리고, 각 작업
+프로세스는 그 메모리를 복사하지 않고 파일처럼 읽는다. 시트 하나를 다 읽으면(dtype 축소와
+열 통계까지 작업 프로세스에서 마친 뒤) 바로 돌려주므로 화면에 끝난 시트부터 차례로 보여줄 수 있다.
+"""
+import io
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from utils.column_stats import profile_columns
+from utils.dtype_optimizer import optimize_dtypes
+from utils.excel_stream import read_excel_streaming
+
+MAX_WORKERS = 4
+
+
+class _BufferFile(io.RawIOBase):
+    # 공유 메모리(memoryview)를 복사 없이 읽는 읽기 전용 파일 객체 (zipfile/openpyxl이 쓰는 read/seek/tell)
+    def __init__(self, buffer, name):
+        super().__init__()
+        self._buffer = buffer
+        self._position = 0
+        self.name = name
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, target):
+        size = min(len(target), len(self._buffer) - self._position)
+        if size <= 0:
+            return 0
+        target[:size] = self._buffer[self._position:self._position + size]
+        self._position += size
+        return size
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._position, io.SEEK_END: len(self._buffer)}[whence]
+        self._position = max(base + offset, 0)
+        return self._position
+
+    def tell(self):
+        return self._position
+
+    def close(self):
+        self._buffer = b""
+        super().close()
+
+
+def _parse_sheet(shm_name, size, filename, sheet_name, max_rows):
+    # 작업 프로세스에서 실행: (시트 이름, 축소된 DataFrame, 캐시에 함께 둘 meta)를 돌려준다
+    # 작업 프로세스는 부모의 resource_tracker를 함께 쓰므로, 붙을 때 등록돼도 지우는 것은 부모(unlink)뿐이다
+    shm = shared_memory.SharedMemory(name=shm_name)
+    view = shm.buf[:size]
+    try:
+        with _BufferFile(view, filename) as file:
+            df = read_excel_streaming(file, sheet_name=sheet_name, max_rows=max_rows)
+    finally:
+        view.release()
+        shm.close()
+    df, report = optimize_dtypes(df)
+    meta = {
+        "rows": len(df),
+        "memory_report": report.to_dict(orient="records"),
+        "column_stats": profile_columns(df),
+    }
+    return sheet_name, df, meta
+
+
+def make_pool(workers=None):
+    """시트 읽기용 프로세스 풀. 스레드가 도는 Streamlit 서버를 fork하지 않도록 spawn으로 띄운다."""
+    workers = workers or min(MAX_WORKERS, os.cpu_count() or 1)
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+
+
+def sheet_names(data, filename=""):
+    if filename.lower().endswith(".xls"):
+        return pd.ExcelFile(io.BytesIO(data)).sheet_names
+
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(io.BytesIO(data), read_only=True)
+    try:
+        return workbook.sheetnames
+    finally:
+        workbook.close()
+
+
+def parse_sheets(pool, data, filename, names, max_rows=None):
+    """names의 시트들을 pool에서 동시에 읽으며, 끝나는 순서대로 (시트 이름, df, meta)를 내준다."""
+    if not names:
+        return
+    shm = shared_memory.SharedMemory(create=True, size=max(len(data), 1))
+    try:
+        shm.buf[:len(data)] = data
+        futures = [pool.submit(_parse_sheet, shm.name, len(data), filename, name, max_rows) for name in names]
+        try:
+            for future in as_completed(futures):
+                yield future.result()
+        finally:
+            # 중간에 멈추면(재실행, 오류) 아직 시작 안 한 시트는 취소하고, 읽는 중인 시트가 끝나길 기다린다
+            for future in futures:
+                future.cancel()
+            for future in futures:
+                if not future.cancelled():
+                    future.exception()
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def _missing_column(like, length):
+    # like와 같은 dtype의 빈 값(NaN/NaT/NA)만 있는 열 (정수처럼 빈 값을 못 담으면 pandas가 float로 넓힌다)
+    return like.iloc[:0].reindex(range(length))
+
+
+def stack_sheets(frames, label="시트"):
+    """{시트 이름: df}를 위아래로 쌓고 어느 시트의 행인지 label 열(category)을 붙인다.
+
+    열마다 한 번만 이어 붙이며, 모든 시트에서 category인 열은 범주를 합쳐 category로 유지한다
+    (pd.concat은 범주가 다르면 object로 바꿔 메모리가 크게 늘어난다).
+    """
+    frames = {name: df for name, df in frames.items() if len(df.columns)}
+    if not frames:
+        return pd.DataFrame()
+    names = list(frames)
+    lengths = [len(df) for df in frames.values()]
+    all_columns = list(dict.fromkeys(column for df in frames.values() for column in df.columns))
+    if label in all_columns:
+        label = f"{label} (구분)"
+    columns = {label: pd.Categorical.from_codes(
+        np.repeat(np.arange(len(names)), lengths), categories=pd.Index(names)
+    )}
+    for column in all_columns:
+        like = next(df[column] for df in frames.values() if column in df.columns)
+        # 열이 없는 시트는 그 열의 dtype으로 빈 값을 채운다 (object로 채우면 숫자 열이 object가 된다)
+        parts = [df[column] if column in df.columns else _missing_column(like, len(df))
+                 for df in frames.values()]
+        if all(isinstance(part.dtype, pd.CategoricalDtype) for part in parts):
+            columns[column] = pd.api.types.union_categoricals(parts, ignore_order=True)
+        else:
+            columns[column] = pd.concat(parts, ignore_index=True)
+    return pd.DataFrame(columns)
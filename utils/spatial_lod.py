@@ -0,0 +1,108 @@
+"""확대 수준(zoom)에 따라 점 데이터를 격자로 미리 집계해 두는 다중 해상도 피라미드.
+
+위도/경도 격자 크기를 여러 단계(각 단계는 바로 아래 단계의 2배)로 정해 두고, 칸별 점 개수,
+평균값, 최댓값을 NumPy 정렬 + reduceat으로 계산한다. 지도가 보고 있는 범위(bounds)에 점이
+충분히 적으면 원본 점을, 많으면 확대 수준에 맞는 격자 집계만 돌려준다.
+"""
+import numpy as np
+
+# 격자 한 칸의 크기(도). 세계 전체 ~ 도시 수준
+CELL_SIZES = (8.0, 4.0, 2.0, 1.0, 0.5, 0.25, 0.125, 0.0625)
+
+
+def _group(rows, cols, n_cols, count, total, maximum):
+    # 같은 칸(rows, cols)끼리 정렬한 뒤 reduceat으로 개수/합/최댓값을 한 번에 모은다
+    keys = rows * n_cols + cols
+    if not len(keys):
+        return keys, keys, count, total, maximum
+    order = np.argsort(keys)
+    keys = keys[order]
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    cell_keys = keys[starts]
+    return (
+        cell_keys // n_cols, cell_keys % n_cols,
+        np.add.reduceat(count[order], starts),
+        np.add.reduceat(total[order], starts),
+        np.maximum.reduceat(maximum[order], starts),
+    )
+
+
+class GridLevel:
+    def __init__(self, cell_size, rows, cols, count, total, maximum):
+        self.cell_size = cell_size
+        self.rows, self.cols = rows, cols
+        self.count = count
+        self.total = total
+        self.max = maximum
+        self.mean = total / count
+        self.lat = (rows + 0.5) * cell_size - 90      # 칸 중심 위도
+        self.lon = (cols + 0.5) * cell_size - 180     # 칸 중심 경도
+
+    @classmethod
+    def from_points(cls, cell_size, lat, lon, values):
+        n_cols = int(np.ceil(360 / cell_size))
+        rows = np.floor((lat.astype(np.float64) + 90) / cell_size).astype(np.int64)
+        cols = np.clip(np.floor((lon.astype(np.float64) + 180) / cell_size).astype(np.int64), 0, n_cols - 1)
+        values = values.astype(np.float64)
+        return cls(cell_size, *_group(rows, cols, n_cols, np.ones(len(values), dtype=np.int64), values, values))
+
+    def coarsen(self, cell_size):
+        # 더 큰 칸은 원본 점 대신 바로 아래 단계의 칸들을 모아서 만든다
+        factor = int(round(cell_size / self.cell_size))
+        n_cols = int(np.ceil(360 / cell_size))
+        return GridLevel(cell_size, *_group(
+            self.rows // factor, np.minimum(self.cols // factor, n_cols - 1), n_cols,
+            self.count, self.total, self.max,
+        ))
+
+    def select(self, mask):
+        return {
+            "lat": self.lat[mask], "lon": self.lon[mask], "count": self.count[mask],
+            "mean": self.mean[mask], "max": self.max[mask],
+        }
+
+
+def _in_bounds(lat, lon, bounds):
+    # bounds: (남, 서, 북, 동). 날짜변경선을 넘는 범위(서 > 동)도 처리한다
+    south, west, north, east = bounds
+    lat_ok = (lat >= south) & (lat <= north)
+    if east - west >= 360:
+        return lat_ok
+    west = (west + 180) % 360 - 180
+    east = (east + 180) % 360 - 180
+    if west <= east:
+        return lat_ok & (lon >= west) & (lon <= east)
+    return lat_ok & ((lon >= west) | (lon <= east))
+
+
+class GridPyramid:
+    def __init__(self, lat, lon, values, cell_sizes=CELL_SIZES):
+        self.lat = np.asarray(lat, dtype=np.float32)
+        self.lon = np.asarray(lon, dtype=np.float32)
+        self.values = np.asarray(values, dtype=np.float32)
+        # 가장 작은 칸만 원본 점으로 만들고, 큰 칸은 한 단계 작은 칸을 모아서 만든다
+        sizes = sorted(cell_sizes)
+        levels = [GridLevel.from_points(sizes[0], self.lat, self.lon, self.values)]
+        for size in sizes[1:]:
+            levels.append(levels[-1].coarsen(size))
+        self.levels = levels[::-1]
+
+    def level_for_zoom(self, zoom):
+        # 타일 한 장(256px)에 칸이 8개 정도 들어가는 크기를 고른다
+        target = 360 / 2 ** zoom / 8
+        for level in self.levels:
+            if level.cell_size <= target:
+                return level
+        return self.levels[-1]
+
+    def query(self, bounds, zoom, max_points=5_000):
+        """("points", 원본 인덱스) 또는 ("cells", 격자 집계 dict)를 돌려준다."""
+        mask = _in_bounds(self.lat, self.lon, bounds)
+        if np.count_nonzero(mask) <= max_points:
+            return "points", np.flatnonzero(mask)
+        level = self.level_for_zoom(zoom)
+        # 칸 중심이 화면 밖이어도 칸이 걸쳐 있으면 포함되도록 반 칸만큼 넓힌다
+        half = level.cell_size / 2
+        south, west, north, east = bounds
+        cell_mask = _in_bounds(level.lat, level.lon, (south - half, west - half, north + half, east + half))
+        return "cells", level.select(cell_mask)
@@ -0,0 +1,92 @@
+"""수업용 가상 데이터를 한 번만 만들어 디스크(.npy)에 두고 여러 세션이 함께 쓰는 저장소.
+
+(생성기 이름, 시드, 크기)가 같으면 같은 데이터이므로, 처음 한 번만 np.random.Generator로
+조각(chunk) 단위로 만들어 메모리 맵 .npy 파일에 바로 써 둔다. 이후에는 파일을 읽기 전용
+메모리 맵으로 열어 돌려주므로 세션마다 복사본을 RAM에 들고 있지 않는다.
+"""
+import os
+import threading
+
+import numpy as np
+
+from utils.config import CACHE_DIR
+from utils.disk_cache import evict_lru, touch
+
+
+def _heights(rng, n):
+    return {"키": rng.normal(170, 5, n)}
+
+
+def _plant(rng, n):
+    temperature = rng.uniform(15, 30, n)
+    return {"온도": temperature, "성장률": 0.5 * temperature + rng.normal(0, 2, n)}
+
+
+def _earthquakes(rng, n):
+    return {"lat": rng.uniform(-60, 80, n), "lon": rng.uniform(-180, 180, n), "magnitude": rng.uniform(2, 7, n)}
+
+
+# 이름 -> (열 이름들, 생성 함수(rng, n) -> {열: 배열})
+GENERATORS = {
+    "heights": (("키",), _heights),
+    "plant": (("온도", "성장률"), _plant),
+    "earthquakes": (("lat", "lon", "magnitude"), _earthquakes),
+}
+
+
+class SyntheticStore:
+    def __init__(self, root=None, chunk_rows=1_000_000, max_bytes=1024 ** 3, dtype=np.float32):
+        self.root = root if root else CACHE_DIR / "synthetic"
+        os.makedirs(self.root, exist_ok=True)
+        self.chunk_rows = chunk_rows
+        self.max_bytes = max_bytes
+        self.dtype = np.dtype(dtype)
+        self._memo = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def _path(self, name, seed, size, column):
+        # 같은 데이터의 열 파일들은 이름 앞부분이 같아 evict_lru가 한 항목으로 지운다
+        return os.path.join(self.root, f"{name}-{seed}-{size}.{column}.npy")
+
+    def _key_lock(self, key):
+        with self._lock:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def get(self, name, seed, size):
+        """{열 이름: 읽기 전용 메모리 맵 배열}을 돌려준다. 없으면 만든다."""
+        key = (name, seed, size)
+        with self._key_lock(key):
+            columns = self._memo.get(key)
+            if columns is not None and all(os.path.exists(self._path(*key, c)) for c in columns):
+                return columns
+            names = GENERATORS[name][0]
+            paths = [self._path(*key, c) for c in names]
+            if not all(os.path.exists(p) for p in paths):
+                self._generate(name, seed, size)
+                evict_lru(self.root, self.max_bytes)
+            for path in paths:
+                touch(path)
+            columns = {c: np.load(p, mmap_mode="r") for c, p in zip(names, paths)}
+            self._memo[key] = columns
+            return columns
+
+    def _generate(self, name, seed, size):
+        names, generate = GENERATORS[name]
+        paths = [self._path(name, seed, size, c) for c in names]
+        tmp_paths = [p + ".tmp" for p in paths]
+        outputs = [
+            np.lib.format.open_memmap(p, mode="w+", dtype=self.dtype, shape=(size,)) for p in tmp_paths
+        ]
+        # 조각마다 (시드, 조각 번호)로 독립된 난수 흐름을 쓴다 (같은 조각 크기면 항상 같은 데이터)
+        for index, start in enumerate(range(0, size, self.chunk_rows)):
+            stop = min(start + self.chunk_rows, size)
+            rng = np.random.default_rng([seed, index])
+            chunk = generate(rng, stop - start)
+            for column, out in zip(names, outputs):
+                out[start:stop] = chunk[column]
+        for out in outputs:
+            out.flush()
+        del outputs
+        for tmp_path, path in zip(tmp_paths, paths):
+            os.replace(tmp_path, path)
@@ -0,0 +1,250 @@
+"""엑셀 업로드 페이지에서 함께 쓰는 데이터 불러오기 단계."""
+import hashlib
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from utils.column_stats import ColumnIndex, profile_columns
+from utils.data_window import filter_mask, sort_order, visible_positions, window
+from utils.dataset_cache import DatasetCache, dataset_key
+from utils.dtype_optimizer import optimize_dtypes
+from utils.excel_stream import read_excel_streaming
+from utils.profiler import section
+from utils.sheet_pool import make_pool, parse_sheets, sheet_names, stack_sheets
+
+# 미리보기 한 페이지에 보여줄 수 있는 행 수
+PAGE_SIZES = [20, 50, 100, 500, 1000]
+
+# 시트 선택 상자에서 모든 시트를 위아래로 쌓아 보는 항목
+STACK_ALL = "(모든 시트 쌓기)"
+
+
+@dataclass
+class UploadedDataset:
+    df: pd.DataFrame
+    key: str                                  # 내용 해시 기반 캐시 키
+    meta: dict = field(default_factory=dict)  # 캐시에 함께 저장되는 부가 정보 (메모리 보고서, 열 통계 등)
+
+    @property
+    def column_index(self):
+        # 업로드할 때 만든 열 통계 색인 (열 선택지, 구간, 축 범위는 데이터 대신 이것을 읽는다)
+        return ColumnIndex(self.meta.get("column_stats", []))
+
+
+# 파싱 결과 캐시는 프로세스 전체(모든 페이지, 모든 세션)에서 하나를 함께 쓴다
+@st.cache_resource
+def get_dataset_cache():
+    return DatasetCache()
+
+
+# 시트를 동시에 읽는 작업 프로세스들도 프로세스 전체에서 하나를 함께 쓴다 (띄우는 비용이 크므로)
+@st.cache_resource
+def get_sheet_pool():
+    return make_pool()
+
+
+def load_uploaded_excel(uploaded_file, max_rows=None, chunk_rows=5000, sheet_name=None):
+    # 같은 파일(내용 해시)을 이미 읽은 적이 있으면 엑셀을 다시 파싱하지 않는다
+    cache = get_dataset_cache()
+    key = dataset_key(uploaded_file.getvalue(), sheet_name, max_rows=max_rows, optimized=True)
+    cached = cache.get(key)
+    if cached is not None:
+        df, meta = _with_column_stats(cache, key, *cached)
+    else:
+        df = _parse_excel(uploaded_file, max_rows, chunk_rows, sheet_name)
+        # 숫자형 축소, 날짜 문자열 변환, 범주형 변환으로 세션당 메모리를 줄인다
+        df, report = optimize_dtypes(df)
+        # 열 통계는 업로드할 때 한 번만 구해 함께 저장한다
+        with section("열 통계 만들기", rows=len(df)):
+            column_stats = profile_columns(df)
+        meta = {"rows": len(df), "memory_report": report.to_dict(orient="records"), "column_stats": column_stats}
+        cache.put(key, df, meta)
+
+    if max_rows and len(df) >= max_rows:
+        st.info(f"최대 {max_rows:,}행까지만 읽었습니다. 사이드바에서 행 수 제한을 바꿀 수 있습니다.")
+    return UploadedDataset(df, key, meta)
+
+
+def load_uploaded_workbook(uploaded_file, max_rows=None, chunk_rows=5000):
+    """시트가 여러 개면 아직 안 읽은 시트를 작업 프로세스들에서 동시에 읽고, 시트 선택 상자를 보여준다.
+
+    시트마다 따로 캐시하므로 한 번 읽은 시트는 다시 파싱하지 않는다. 시트가 하나면
+    load_uploaded_excel과 같다. 선택한 시트(또는 모든 시트를 쌓은 표)의 UploadedDataset을 돌려준다.
+    """
+    data = uploaded_file.getvalue()
+    file_digest = hashlib.sha256(data).digest()
+    names = _sheet_names(file_digest.hex(), uploaded_file.name, data)
+    if len(names) <= 1:
+        return load_uploaded_excel(uploaded_file, max_rows=max_rows, chunk_rows=chunk_rows)
+
+    cache = get_dataset_cache()
+    keys = {name: dataset_key(file_digest, name, max_rows=max_rows, optimized=True) for name in names}
+    missing = [name for name in names if not cache.contains(keys[name])]
+    if missing:
+        _parse_sheets(data, uploaded_file.name, missing, keys, max_rows)
+
+    choice = st.selectbox("시트 선택", names + [STACK_ALL], help=f"시트 {len(names)}개")
+    # 캐시 용량 제한으로 읽어 둔 시트가 지워졌으면 그 시트만 다시 읽는다
+    evicted = [name for name in (names if choice == STACK_ALL else [choice]) if not cache.contains(keys[name])]
+    if evicted:
+        _parse_sheets(data, uploaded_file.name, evicted, keys, max_rows)
+    if choice == STACK_ALL:
+        dataset = _stacked_dataset(tuple(keys.items()))
+    else:
+        df, meta = _with_column_stats(cache, keys[choice], *cache.get(keys[choice]))
+        dataset = UploadedDataset(df, keys[choice], meta)
+
+    if max_rows and len(dataset.df) >= max_rows and choice != STACK_ALL:
+        st.info(f"최대 {max_rows:,}행까지만 읽었습니다. 사이드바에서 행 수 제한을 바꿀 수 있습니다.")
+    return dataset
+
+
+# 시트 목록은 내용 해시별로 한 번만 읽는다 (재실행마다 통합 문서를 열면 캐시된 Parquet 읽기보다 훨씬 느림)
+@st.cache_data(max_entries=64, show_spinner=False)
+def _sheet_names(digest, filename, _data):
+    return sheet_names(_data, filename)
+
+
+def _parse_sheets(data, filename, names, keys, max_rows):
+    # 끝난 시트부터 목록에 한 줄씩 추가하고 바로 캐시에 넣는다 (중간에 재실행돼도 끝난 시트는 남는다)
+    total_rows = 0
+    with section(f"엑셀 읽기 (시트 {len(names)}개 동시)") as read_section, \
+            st.status(f"시트 {len(names)}개를 동시에 읽는 중...", expanded=True) as status:
+        progress = st.progress(0.0)
+        for done, (name, df, meta) in enumerate(parse_sheets(get_sheet_pool(), data, filename, names, max_rows), 1):
+            get_dataset_cache().put(keys[name], df, meta)
+            total_rows += len(df)
+            st.write(f"✅ {name}: {len(df):,}행")
+            progress.progress(done / len(names), text=f"{done} / {len(names)}개 시트 완료")
+        read_section.rows = total_rows
+        status.update(label=f"시트 {len(names)}개, {total_rows:,}행을 읽었습니다.", state="complete", expanded=False)
+
+
+@st.cache_resource(max_entries=2, show_spinner="시트를 합치는 중...")
+def _stacked_dataset(sheet_keys):
+    # 쌓은 표는 원본 시트들과 같은 내용이라 디스크에는 두지 않고 메모리에만 (최근 2개) 둔다
+    cache = get_dataset_cache()
+    frames = {}
+    for name, key in sheet_keys:
+        frames[name] = cache.get(key)[0]
+    df = stack_sheets(frames)
+    key = dataset_key("".join(key for _, key in sheet_keys).encode(), STACK_ALL)
+    return UploadedDataset(df, key, {"rows": len(df), "sheets": len(frames), "column_stats": profile_columns(df)})
+
+
+def _with_column_stats(cache, key, df, meta):
+    # 열 통계가 생기기 전에 저장된 항목이면 한 번만 만들어 meta에 덧붙여 둔다
+    if "column_stats" not in meta:
+        meta = {**meta, "column_stats": profile_columns(df)}
+        cache.put_meta(key, meta)
+    return df, meta
+
+
+# 히스토그램 칸별 개수도 데이터셋/열마다 한 번만 센다 (구간 경계는 열 통계 색인에서)
+@st.cache_resource(max_entries=32, show_spinner=False)
+def _column_histogram(dataset_key, column, _values, _edges):
+    counts, _ = np.histogram(_values.dropna().to_numpy(dtype=np.float64), bins=_edges)
+    return counts
+
+
+def column_histogram(dataset, column):
+    """(칸별 개수, 구간 경계). 구간은 열 통계로 정한다 (값 종류가 적은 정수 열은 값마다 한 칸).
+
+    값이 하나도 없는(전부 빈 값/무한대) 열은 구간을 정할 수 없어 None을 돌려준다.
+    """
+    edges = dataset.column_index.histogram_edges(column)
+    if edges is None:
+        return None
+    return _column_histogram(dataset.key, column, dataset.df[column], edges), edges
+
+
+def show_column_stats(dataset):
+    index = dataset.column_index
+    if not index.stats:
+        return
+    with st.expander(f"컬럼 통계 ({len(index.stats)}개 컬럼, 업로드할 때 계산)"):
+        st.dataframe(index.summary_frame(), hide_index=True)
+
+
+def _format_kb(kb):
+    return f"{kb / 1024:,.1f} MB" if kb >= 1024 else f"{kb:,.1f} KB"
+
+
+def show_memory_report(dataset):
+    report = pd.DataFrame(dataset.meta.get("memory_report", []))
+    if report.empty:
+        return
+    before = report["변환 전 메모리 (KB)"].sum()
+    after = report["변환 후 메모리 (KB)"].sum()
+    with st.expander(f"메모리 사용량: {_format_kb(before)} → {_format_kb(after)}"):
+        st.dataframe(report, hide_index=True)
+
+
+# 정렬 순서와 필터 결과(행 위치 배열)는 데이터셋 키별로 보관해, 페이지를 넘길 때 다시 계산하지 않는다
+@st.cache_resource(max_entries=8, show_spinner=False)
+def _sort_order(dataset_key, column, ascending, _series):
+    return sort_order(_series, ascending)
+
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def _filter_mask(dataset_key, column, query, _series):
+    return filter_mask(_series, query)
+
+
+@st.fragment
+def show_preview(dataset):
+    """보이는 페이지의 행만 보내는 미리보기. 정렬/필터/페이지 이동은 서버에서 행 위치로 처리하고,
+    조작할 때는 페이지 전체가 아니라 이 부분만 다시 실행된다."""
+    df = dataset.df
+    col_sort, col_direction, col_filter, col_query = st.columns([2, 1, 2, 2])
+    sort_column = col_sort.selectbox("정렬 기준", df.columns, index=None, placeholder="원래 순서")
+    descending = col_direction.toggle("내림차순", disabled=sort_column is None)
+    filter_column = col_filter.selectbox("필터 컬럼", df.columns, index=None, placeholder="필터 없음")
+    query = col_query.text_input("필터 값", placeholder="글자 포함, 또는 > 10, 10..20", disabled=filter_column is None)
+
+    order = _sort_order(dataset.key, sort_column, not descending, df[sort_column]) if sort_column is not None else None
+    mask = None
+    if filter_column is not None and query.strip():
+        try:
+            mask = _filter_mask(dataset.key, filter_column, query.strip(), df[filter_column])
+        except ValueError as e:
+            st.warning(str(e))
+    positions = visible_positions(len(df), order, mask)
+
+    col_size, col_page = st.columns(2)
+    page_size = col_size.selectbox("페이지당 행 수", PAGE_SIZES, index=1)
+    pages = max(-(-len(positions) // page_size), 1)
+    page = col_page.number_input(f"페이지 (전체 {pages:,}쪽)", min_value=1, max_value=pages, value=1)
+    offset = (page - 1) * page_size
+
+    rows = window(df, positions, offset, page_size)
+    st.dataframe(rows)
+    matched = f"{len(positions):,}행 일치 · " if mask is not None else ""
+    shown = f"{offset + 1:,}–{offset + len(rows):,}행 표시" if len(rows) else "표시할 행이 없습니다"
+    st.caption(f"전체 {len(df):,}행 · {matched}{shown} (왼쪽 숫자는 원래 행 번호)")
+
+
+def _parse_excel(uploaded_file, max_rows, chunk_rows, sheet_name):
+    # 첫 조각이 읽히는 즉시 미리보기를 보여주고, 나머지는 진행률을 표시하며 읽는다
+    preview = st.empty()
+    progress = st.progress(0.0, text="엑셀 파일을 읽는 중...")
+
+    def on_chunk(first_chunk, rows_read, total_rows):
+        if rows_read == len(first_chunk):
+            preview.dataframe(first_chunk.head())
+        if total_rows:
+            progress.progress(min(rows_read / total_rows, 1.0), text=f"{rows_read:,} / {total_rows:,}행 읽는 중...")
+        else:
+            progress.progress(0.0, text=f"{rows_read:,}행 읽는 중...")
+
+    uploaded_file.seek(0)
+    with section("엑셀 읽기") as read_section:
+        df = read_excel_streaming(
+            uploaded_file, sheet_name=sheet_name, chunk_rows=chunk_rows, max_rows=max_rows, on_chunk=on_chunk
+        )
+        read_section.rows = len(df)
+    preview.empty()
+    progress.empty()
+    return df